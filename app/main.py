@@ -45,6 +45,12 @@ app.add_middleware(
 agent_service = AgentService()
 supabase_service = SupabaseService()
 
+@app.on_event("shutdown")
+async def close_http_pool():
+    """Drain the shared OpenAI HTTP connection pool on shutdown."""
+    from app.services.openai_service import aclose_shared_http
+    await aclose_shared_http()
+
 # Health check endpoint
 @app.get("/")
 async def root():
@@ -45,6 +45,16 @@ class Job(JobBase):
     user_id: str = Field(..., description="User who owns this job entry")
     date_added: datetime = Field(..., description="When job was added")
     last_updated: datetime = Field(..., description="Last status change")
-    
+
+    @property
+    def search_text(self) -> str:
+        """Lowercased title/company/description haystack for case-insensitive search.
+
+        Kept as a plain property: Pydantic models don't support __slots__, and a
+        cached_property would survive model_copy with a stale value, so callers
+        that search repeatedly (JobService) cache this per job id instead.
+        """
+        return f"{self.job_title}\x00{self.company_name}\x00{self.job_description or ''}".lower()
+
     class Config:
         from_attributes = True
@@ -82,7 +82,7 @@ class AgentService:
             # Use OpenAI for intent classification, with safe fallbacks
             has_link = self._contains_job_link(user_message.message)
             looks_like_search = self._is_job_search_query(user_message.message)
-            intent, confidence = await self.openai_service.classify_intent(user_message.message)
+            (intent, confidence), extraction_pre = await self.openai_service.analyze_message(user_message.message)
             if intent in (IntentType.UNKNOWN, IntentType.AMBIGUOUS) or confidence < 0.6:
                 # Fallback to lightweight keyword rules
                 fb_intent, fb_conf = self._classify_intent_simple(user_message.message)
@@ -102,7 +102,8 @@ class AgentService:
                 "internal ids", "internal id", "environment variables", "env vars", "env variables",
                 "secret key", "secrets", "service key", "api keys", "api key", "credentials", "password", "tokens"
             ]
-            is_unsafe_llm, unsafe_conf, unsafe_reason = await self.openai_service.detect_unsafe_request(user_message.message)
+            classification = await self.openai_service.classify_all(user_message.message)
+            is_unsafe_llm, unsafe_conf, unsafe_reason = classification["unsafe"]
             if is_unsafe_llm or any(marker in lower for marker in unsafe_markers):
                 refusal = await self.openai_service.generate_friendly_refusal(unsafe_reason or "sensitive data request")
                 agent_response = AgentResponse(
@@ -130,11 +131,11 @@ class AgentService:
                 return agent_response
 
             # Enhanced emotional intelligence handling
-            is_job_related, jr_conf = await self.openai_service.detect_job_related(user_message.message)
+            is_job_related, jr_conf = classification["job_related"]
             
             # If it's job-related but emotionally charged, handle with empathy first
             if is_job_related:
-                emotion, emotion_conf = await self.openai_service.detect_emotional_state(user_message.message)
+                emotion, emotion_conf = classification["emotion"]
                 
                 # Special handling for interview anxiety and frustration
                 if emotion in ["anxious", "frustrated", "disappointed"] and emotion_conf > 0.7:
@@ -219,7 +220,7 @@ class AgentService:
             if intent == IntentType.NEW_JOB:
                 if has_link:
                     return await self._handle_job_link_message(user_message)
-                extraction = await self.openai_service.extract_job_details(user_message.message)
+                extraction = extraction_pre
                 created_response = await self._maybe_create_job_from_extraction(user_message, extraction)
                 if created_response:
                     agent_response = created_response
@@ -308,7 +309,7 @@ class AgentService:
                             conversation_id=conversation_id,
                         )
             elif intent == IntentType.STATUS_UPDATE:
-                extraction = await self.openai_service.extract_job_details(user_message.message)
+                extraction = extraction_pre
                 new_status = extraction.status or JobStatus.INTERVIEW if "interview" in user_message.message.lower() else extraction.status
                 bulk_all = self._is_bulk_all_command(user_message.message)
 
@@ -648,7 +649,7 @@ class AgentService:
                             )
             elif intent == IntentType.JOB_DELETE:
                 # Handle job deletion requests
-                extraction = await self.openai_service.extract_job_details(user_message.message)
+                extraction = extraction_pre
                 
                 # Check if they want to delete by specific criteria (status, company, or both)
                 if extraction.status or extraction.company_name:
@@ -762,7 +763,7 @@ class AgentService:
                     )
                 else:
                 # Try to extract optional filters
-                    extraction = await self.openai_service.extract_job_details(user_message.message)
+                    extraction = extraction_pre
                     if extraction.company_name or extraction.job_title:
                         jobs = await self.supabase_service.search_jobs(
                             user_id=str(user_message.user_id),
@@ -829,7 +830,7 @@ class AgentService:
                     )
             else:
                 # First, see if this message suggests a status update even if intent wasn't classified
-                extraction2 = await self.openai_service.extract_job_details(user_message.message)
+                extraction2 = extraction_pre
                 if extraction2.status and (extraction2.company_name or extraction2.job_title):
                     # Try to resolve a status update using extracted fields
                     matches = await self.supabase_service.search_jobs(
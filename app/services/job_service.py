@@ -4,123 +4,313 @@ Handles job-related database operations and business logic
 """
 
 import logging
+import re
+import sys
+import time
 import uuid
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Set
+from pydantic import ValidationError
 from app.models.job import Job, JobCreate, JobUpdate, JobStatus
 
 logger = logging.getLogger(__name__)
 
 class JobService:
-    """Service for job-related operations"""
-    
+    """Service for job-related operations
+
+    The in-memory dev backend is CPU-only, so the real work lives in sync
+    `_*_sync` methods; the public `async def` methods are thin wrappers kept
+    for signature compatibility with the eventual Supabase-backed service.
+    Internal hops (e.g. search -> user jobs) call the sync path directly to
+    avoid allocating a coroutine per lookup.
+    """
+
     def __init__(self):
         # TODO: Initialize Supabase client
         self.jobs = {}  # Temporary in-memory storage for development
-    
-    async def create_job(self, job_data: JobCreate) -> Job:
+        # Per-user view of the same Job objects so read paths walk only the
+        # owning user's jobs: user_id -> {job_id -> Job}
+        self._jobs_by_user = defaultdict(dict)
+        # Pre-lowered "title\x00company\x00description" per job so search_jobs
+        # does one substring test instead of lowercasing every field per query
+        self._search_text = {}  # job_id -> lowercased searchable text
+        # Inverted token index so query filtering scales with matching jobs,
+        # not all of a user's jobs: user_id -> token -> set of job_ids
+        self._tokens_by_user = defaultdict(lambda: defaultdict(set))
+        # Status buckets so filter-by-status only touches the selected bucket:
+        # (user_id, status) -> set of job_ids
+        self._jobs_by_user_status = defaultdict(set)
+        # Per-user company buckets, keyed by the case-folded name so the
+        # company filter scans only the querying user's distinct companies
+        # with no per-query lowering: user_id -> {company_lower -> set of job_ids}
+        self._jobs_by_user_company = defaultdict(dict)
+        # Columnar date_added (epoch nanoseconds) so sorts and recency scans
+        # compare 8-byte ints instead of datetime attributes on Pydantic rows
+        self._date_added_ts = {}  # job_id -> int (ns since epoch)
+        # Per-user write counter; bumping it on every mutation invalidates the
+        # stats cache for that user
+        self._write_version = defaultdict(int)
+        # Stats memo: user_id -> (write_version, counts). One entry per user,
+        # replaced in place, so no LRU policy is needed; the time-dependent
+        # recent_applications figure is deliberately not stored here
+        self._stats_cache = {}
+
+    _TOKEN_PATTERN = re.compile(r"\W+")
+
+    @staticmethod
+    def _build_search_text(job: Job) -> str:
+        """Build the lowercased haystack used for substring search"""
+        return job.search_text
+
+    @classmethod
+    def _tokenize(cls, text: str) -> Set[str]:
+        """Split lowercased text into search tokens"""
+        return {t for t in cls._TOKEN_PATTERN.split(text.lower()) if t}
+
+    def _index_job(self, job: Job) -> None:
+        """(Re)index a job's tokens in the per-user inverted index"""
+        self._unindex_job(job.id, job.user_id)
+        tokens = self._tokens_by_user[job.user_id]
+        for token in self._tokenize(self._search_text[job.id]):
+            tokens[token].add(job.id)
+
+    def _unindex_job(self, job_id: str, user_id: str) -> None:
+        """Remove a job from the per-user inverted index"""
+        tokens = self._tokens_by_user.get(user_id)
+        if not tokens:
+            return
+        for token in list(tokens):
+            tokens[token].discard(job_id)
+            if not tokens[token]:
+                del tokens[token]
+
+    def _discard_from_company_bucket(self, job_id: str, user_id: str, company_name: str) -> None:
+        """Remove a job from its company bucket, dropping the key when empty"""
+        buckets = self._jobs_by_user_company.get(user_id)
+        if not buckets:
+            return
+        key = company_name.lower()
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.discard(job_id)
+            if not bucket:
+                del buckets[key]
+
+    def _company_match_ids(self, user_id: str, company: str) -> Set[str]:
+        """Union the buckets of companies whose name contains the filter text"""
+        company_lower = company.lower()
+        matched: Set[str] = set()
+        for name, bucket in self._jobs_by_user_company.get(user_id, {}).items():
+            if company_lower in name:
+                matched |= bucket
+        return matched
+
+    def _candidate_ids(self, user_id: str, query: str) -> Optional[Set[str]]:
+        """
+        Build a candidate superset from the inverted index.
+
+        Substring semantics mean a query token can match mid-word
+        ("google" must find "Googleplex"), so each query token unions the
+        posting lists of every indexed token that contains it — a scan of
+        the user's distinct tokens, not their jobs. The caller's substring
+        verify then removes false positives, so recall matches the full
+        scan exactly. Returns None when the query has no tokens (caller
+        scans everything); an empty set is an authoritative no-match.
+        """
+        query_tokens = self._tokenize(query)
+        if not query_tokens:
+            return None
+        tokens = self._tokens_by_user.get(user_id, {})
+        candidates: Optional[Set[str]] = None
+        for query_token in query_tokens:
+            matched: Set[str] = set()
+            for token, posting in tokens.items():
+                if query_token in token:
+                    matched |= posting
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return candidates
+        return candidates
+
+    def _create_job_sync(self, job_data: JobCreate) -> Job:
         """
         Create a new job entry
         """
+        job_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+
         try:
-            job_id = str(uuid.uuid4())
-            now = datetime.now(timezone.utc)
-            
             job = Job(
                 id=job_id,
                 user_id=job_data.user_id,
                 job_title=job_data.job_title,
-                company_name=job_data.company_name,
+                # Intern the company so repeat applications share one
+                # string object across Job rows
+                company_name=sys.intern(job_data.company_name),
                 job_link=job_data.job_link,
                 job_description=job_data.job_description,
                 status=job_data.status,
                 date_added=now,
                 last_updated=now
             )
-            
-            # Store in temporary storage
-            self.jobs[job_id] = job
-            
-            logger.info(f"Created job: {job.job_title} at {job.company_name}")
-            return job
-            
-        except Exception as e:
-            logger.error(f"Error creating job: {str(e)}")
+        except ValidationError:
+            logger.exception("Error creating job")
             raise
-    
-    async def get_job(self, job_id: str) -> Optional[Job]:
+
+        # Store in temporary storage
+        self.jobs[job_id] = job
+        self._jobs_by_user[job.user_id][job_id] = job
+        self._search_text[job_id] = self._build_search_text(job)
+        self._date_added_ts[job_id] = int(now.timestamp() * 1_000_000_000)
+        self._index_job(job)
+        self._jobs_by_user_status[(job.user_id, job.status)].add(job_id)
+        self._jobs_by_user_company[job.user_id].setdefault(job.company_name.lower(), set()).add(job_id)
+
+        self._write_version[job.user_id] += 1
+
+        logger.info("Created job: %s at %s", job.job_title, job.company_name)
+        return job
+
+    def _create_jobs_sync(self, jobs_data: List[JobCreate]) -> List[Job]:
+        """
+        Create a batch of job entries in one pass
+
+        For the in-memory backend this is a plain loop; the Supabase-backed
+        implementation should submit the whole batch as a single INSERT so
+        bulk imports pay one round-trip instead of one per job.
+        """
+        return [self._create_job_sync(job_data) for job_data in jobs_data]
+
+    async def create_jobs(self, jobs_data: List[JobCreate]) -> List[Job]:
+        """Async wrapper around the sync batch-create path"""
+        return self._create_jobs_sync(jobs_data)
+
+    async def create_job(self, job_data: JobCreate) -> Job:
+        """Create a single job entry via the batch path"""
+        return self._create_jobs_sync([job_data])[0]
+
+    def _get_job_sync(self, job_id: str) -> Optional[Job]:
         """
         Get a job by ID
         """
-        try:
-            return self.jobs.get(job_id)
-        except Exception as e:
-            logger.error(f"Error getting job {job_id}: {str(e)}")
-            return None
-    
-    async def get_user_jobs(self, user_id: str) -> List[Job]:
+        return self.jobs.get(job_id)
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        """Async wrapper around the sync lookup"""
+        return self._get_job_sync(job_id)
+
+    def _get_user_jobs_sync(self, user_id: str) -> List[Job]:
         """
         Get all jobs for a specific user
         """
-        try:
-            user_jobs = [job for job in self.jobs.values() if job.user_id == user_id]
-            return sorted(user_jobs, key=lambda x: x.date_added, reverse=True)
-        except Exception as e:
-            logger.error(f"Error getting jobs for user {user_id}: {str(e)}")
-            return []
-    
-    async def update_job(self, job_id: str, job_update: JobUpdate) -> Optional[Job]:
+        user_jobs = self._jobs_by_user.get(user_id, {})
+        return sorted(user_jobs.values(), key=lambda x: self._date_added_ts[x.id], reverse=True)
+
+    async def get_user_jobs(self, user_id: str) -> List[Job]:
+        """Async wrapper around the sync listing"""
+        return self._get_user_jobs_sync(user_id)
+
+    def _update_job_sync(self, job_id: str, job_update: JobUpdate) -> Optional[Job]:
         """
         Update an existing job
         """
+        job = self.jobs.get(job_id)
+        if not job:
+            logger.warning("Job %s not found", job_id)
+            return None
+
+        old_status = job.status
+        old_company = job.company_name
+
+        # Build the changed-fields dict once and validate in a single
+        # copy instead of mutating the model attribute by attribute
         try:
-            job = self.jobs.get(job_id)
-            if not job:
-                logger.warning(f"Job {job_id} not found")
-                return None
-            
-            # Update fields
-            if job_update.job_title is not None:
-                job.job_title = job_update.job_title
-            if job_update.company_name is not None:
-                job.company_name = job_update.company_name
-            if job_update.job_link is not None:
-                job.job_link = job_update.job_link
-            if job_update.job_description is not None:
-                job.job_description = job_update.job_description
-            if job_update.status is not None:
-                job.status = job_update.status
-            
-            job.last_updated = datetime.now(timezone.utc)
-            
-            logger.info(f"Updated job {job_id}: {job.job_title}")
-            return job
-            
-        except Exception as e:
-            logger.error(f"Error updating job {job_id}: {str(e)}")
+            updates = {
+                k: v for k, v in job_update.model_dump(exclude_unset=True).items()
+                if v is not None
+            }
+            if "company_name" in updates:
+                updates["company_name"] = sys.intern(updates["company_name"])
+            updates["last_updated"] = datetime.now(timezone.utc)
+            job = job.model_copy(update=updates)
+        except (ValidationError, KeyError):
+            logger.exception("Error updating job %s", job_id)
             return None
-    
-    async def delete_job(self, job_id: str) -> bool:
+
+        self.jobs[job_id] = job
+        self._jobs_by_user[job.user_id][job_id] = job
+
+        self._search_text[job_id] = self._build_search_text(job)
+        self._index_job(job)
+        if job.status != old_status:
+            self._jobs_by_user_status[(job.user_id, old_status)].discard(job_id)
+            self._jobs_by_user_status[(job.user_id, job.status)].add(job_id)
+        if job.company_name != old_company:
+            self._discard_from_company_bucket(job_id, job.user_id, old_company)
+            self._jobs_by_user_company[job.user_id].setdefault(job.company_name.lower(), set()).add(job_id)
+
+        self._write_version[job.user_id] += 1
+
+        logger.info("Updated job %s: %s", job_id, job.job_title)
+        return job
+
+    async def update_job(self, job_id: str, job_update: JobUpdate) -> Optional[Job]:
+        """Async wrapper around the sync update path"""
+        return self._update_job_sync(job_id, job_update)
+
+    def _delete_job_sync(self, job_id: str) -> bool:
         """
         Delete a job
         """
-        try:
-            if job_id in self.jobs:
-                del self.jobs[job_id]
-                logger.info(f"Deleted job {job_id}")
-                return True
-            else:
-                logger.warning(f"Job {job_id} not found for deletion")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error deleting job {job_id}: {str(e)}")
+        if job_id in self.jobs:
+            job = self.jobs.pop(job_id)
+            self._jobs_by_user[job.user_id].pop(job_id, None)
+            self._unindex_job(job_id, job.user_id)
+            self._search_text.pop(job_id, None)
+            self._date_added_ts.pop(job_id, None)
+            self._jobs_by_user_status[(job.user_id, job.status)].discard(job_id)
+            self._discard_from_company_bucket(job_id, job.user_id, job.company_name)
+            self._write_version[job.user_id] += 1
+            logger.info("Deleted job %s", job_id)
+            return True
+        else:
+            logger.warning("Job %s not found for deletion", job_id)
             return False
-    
-    async def search_jobs(
-        self, 
-        user_id: str, 
-        query: str = None, 
+
+    async def delete_job(self, job_id: str) -> bool:
+        """Async wrapper around the sync delete path"""
+        return self._delete_job_sync(job_id)
+
+    def _sorted_jobs(self, job_ids) -> List[Job]:
+        """Materialize jobs for the given ids, newest first"""
+        jobs = [self.jobs[job_id] for job_id in job_ids]
+        jobs.sort(key=lambda x: self._date_added_ts[x.id], reverse=True)
+        return jobs
+
+    def _search_by_status(self, user_id: str, status: JobStatus) -> List[Job]:
+        """Single-filter fast path: return the status bucket directly"""
+        return self._sorted_jobs(self._jobs_by_user_status.get((user_id, status), set()))
+
+    def _search_by_company(self, user_id: str, company: str) -> List[Job]:
+        """Single-filter fast path: union matching company buckets"""
+        return self._sorted_jobs(self._company_match_ids(user_id, company))
+
+    def _search_by_query(self, user_id: str, query: str) -> List[Job]:
+        """Single-filter fast path: token-index superset plus substring verify"""
+        query_lower = query.lower()
+        candidates = self._candidate_ids(user_id, query)
+        if candidates is None:
+            candidates = self._jobs_by_user.get(user_id, {}).keys()
+        search_text = self._search_text
+        return self._sorted_jobs(
+            job_id for job_id in candidates if query_lower in search_text[job_id]
+        )
+
+    def _search_jobs_sync(
+        self,
+        user_id: str,
+        query: str = None,
         status: JobStatus = None,
         company: str = None
     ) -> List[Job]:
@@ -128,61 +318,104 @@ class JobService:
         Search jobs with filters
         """
         try:
-            user_jobs = await self.get_user_jobs(user_id)
-            
-            # Apply filters
-            if query:
-                query_lower = query.lower()
-                user_jobs = [
-                    job for job in user_jobs
-                    if (query_lower in job.job_title.lower() or 
-                        query_lower in job.company_name.lower() or
-                        (job.job_description and query_lower in job.job_description.lower()))
-                ]
-            
+            # No filters: skip the filter pipeline and its list copy entirely
+            if not (query or status or company):
+                return self._get_user_jobs_sync(user_id)
+
+            # Exactly one filter: dispatch to the specialized index path
+            if sum(1 for f in (query, status, company) if f) == 1:
+                if status:
+                    return self._search_by_status(user_id, status)
+                if company:
+                    return self._search_by_company(user_id, company)
+                return self._search_by_query(user_id, query)
+
             if status:
-                user_jobs = [job for job in user_jobs if job.status == status]
-            
-            if company:
-                company_lower = company.lower()
-                user_jobs = [job for job in user_jobs if company_lower in job.company_name.lower()]
-            
-            return user_jobs
-            
+                # Start from the status bucket instead of all user jobs
+                bucket = self._jobs_by_user_status.get((user_id, status), set())
+                jobs_iter = (self.jobs[job_id] for job_id in bucket)
+            else:
+                jobs_iter = self._jobs_by_user.get(user_id, {}).values()
+
+            # Apply all filters in a single pass; only sort the final result.
+            # The substring test runs C-level (str.__contains__ two-way search)
+            # over the precompiled haystack, so the Python loop only does
+            # dict lookups per job; bind the hot dict locally to skip repeated
+            # attribute resolution inside the comprehension.
+            query_lower = query.lower() if query else None
+            candidates = self._candidate_ids(user_id, query) if query else None
+            matched_ids = self._company_match_ids(user_id, company) if company else None
+            search_text = self._search_text
+
+            results = [
+                job for job in jobs_iter
+                if (query_lower is None
+                    or ((candidates is None or job.id in candidates)
+                        and query_lower in search_text[job.id]))
+                and (matched_ids is None or job.id in matched_ids)
+            ]
+            results.sort(key=lambda x: self._date_added_ts[x.id], reverse=True)
+            return results
+
         except Exception as e:
-            logger.error(f"Error searching jobs: {str(e)}")
+            logger.exception("Error searching jobs")
             return []
-    
-    async def get_job_stats(self, user_id: str) -> dict:
+
+    async def search_jobs(
+        self,
+        user_id: str,
+        query: str = None,
+        status: JobStatus = None,
+        company: str = None
+    ) -> List[Job]:
+        """Async wrapper around the sync search path"""
+        return self._search_jobs_sync(user_id, query=query, status=status, company=company)
+
+    def _get_job_stats_sync(self, user_id: str) -> dict:
         """
         Get job application statistics for a user
+
+        The write-version-invariant counts are memoized per user in a plain
+        instance dict (an lru_cache on a bound method would key on self and
+        pin the instance). recent_applications is time-dependent — a "last
+        30 days" window decays even with no writes — so it is recomputed on
+        every call; it's a single integer compare per job.
         """
         try:
-            user_jobs = await self.get_user_jobs(user_id)
-            
-            stats = {
-                "total_applications": len(user_jobs),
-                "by_status": {},
-                "by_company": {},
-                "recent_applications": 0
-            }
-            
-            # Count by status
-            for job in user_jobs:
-                status = job.status.value
-                stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-                
-                # Count by company
-                company = job.company_name
-                stats["by_company"][company] = stats["by_company"].get(company, 0) + 1
-                
-                # Count recent applications (last 30 days)
-                days_ago = (datetime.now(timezone.utc) - job.date_added).days
-                if days_ago <= 30:
-                    stats["recent_applications"] += 1
-            
+            version = self._write_version[user_id]
+            cached = self._stats_cache.get(user_id)
+            if cached is not None and cached[0] == version:
+                counts = cached[1]
+            else:
+                counts = self._compute_job_counts(user_id)
+                self._stats_cache[user_id] = (version, counts)
+
+            cutoff = time.time_ns() - 30 * 86400 * 10**9
+            stats = dict(counts)
+            stats["recent_applications"] = sum(
+                1 for job_id in self._jobs_by_user.get(user_id, {})
+                if self._date_added_ts[job_id] >= cutoff
+            )
             return stats
-            
+
         except Exception as e:
-            logger.error(f"Error getting job stats: {str(e)}")
+            logger.exception("Error getting job stats")
             return {}
+
+    def _compute_job_counts(self, user_id: str) -> dict:
+        """Compute the write-version-invariant stats counts for one user"""
+        # Walk the per-user dict directly; stats don't need a sorted snapshot
+        user_jobs = self._jobs_by_user.get(user_id, {}).values()
+
+        # Count by status/company in one C-level Counter pass over this
+        # user's jobs; unlike scanning the global bucket dicts, this
+        # never touches other users' keys
+        return {
+            "total_applications": len(user_jobs),
+            "by_status": dict(Counter(job.status.value for job in user_jobs)),
+            "by_company": dict(Counter(job.company_name for job in user_jobs)),
+        }
+
+    async def get_job_stats(self, user_id: str) -> dict:
+        """Async wrapper around the sync stats path"""
+        return self._get_job_stats_sync(user_id)
@@ -6,115 +6,911 @@ Handles AI model interactions and intent classification
 import os
 import re
 import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional, Tuple, List
+import math
+import random
+import time
+import textwrap
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, Optional, Tuple, List
 
-from openai import OpenAI
+import httpx
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, RateLimitError
 from openai.types.chat import ChatCompletion
 
 from app.models.job import JobStatus
 from app.models.agent import IntentType, JobExtraction
+from app.services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+def _dump_payload(obj: Any) -> str:
+    """Serialize a prompt payload compactly and deterministically.
+
+    Sorted keys and no whitespace mean identical payloads always produce
+    byte-identical prompts, so they hit both the local exact-match cache
+    and OpenAI's server-side prefix cache, and ship fewer input tokens.
+    """
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+# One pooled HTTP client for every OpenAIService instance. FastAPI DI can
+# construct the service per request; without this each instance would tear
+# down and re-establish its own TCP/TLS connections on every call.
+_shared_http = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=30),
+    timeout=httpx.Timeout(30.0, connect=5.0),
+)
+
+# Worst-case prompt budget, in characters (~4 chars/token, so roughly a
+# 4k-token cap). Payloads are trimmed to this before dispatch so a user
+# with hundreds of tracked jobs gets bounded latency and cost instead of
+# a linearly growing prompt (or a context_length_exceeded error).
+_MAX_PROMPT_CHARS = 16000
+
+def _trim_context(context: Optional[str], budget: int = 2000) -> Optional[str]:
+    """Keep the most recent tail of a conversation context string."""
+    if context and len(context) > budget:
+        return context[-budget:]
+    return context
+
+async def aclose_shared_http() -> None:
+    """Close the shared HTTP pool; call from app shutdown."""
+    await _shared_http.aclose()
+
+# Bound on the exact-match completion cache (entries, LRU eviction)
+_COMPLETION_CACHE_SIZE = 2048
+
+# Labeled few-shot examples seeding the semantic tier, so common phrasings
+# classify locally from the very first request instead of needing a prior
+# LLM answer to imitate. Confidence is deliberately below LLM-sourced
+# entries since these are nearest-example matches, not model output.
+_SEED_EXAMPLE_CONFIDENCE = 0.85
+
+# Model replies use uppercase names with or without underscores
+# (NEW_JOB / NEWJOB); one underscore-free lookup table covers both.
+_INTENT_ALIASES: Dict[str, IntentType] = {
+    name.replace("_", ""): member for name, member in IntentType.__members__.items()
+}
+
+# Structured-output schema for extract_job_details: the API guarantees a
+# conforming JSON object, so no substring scanning is needed on the reply.
+_JOB_EXTRACTION_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_extraction",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "job_title": {"type": ["string", "null"]},
+                "company_name": {"type": ["string", "null"]},
+                "job_link": {"type": ["string", "null"]},
+                "job_description": {"type": ["string", "null"]},
+                "status": {
+                    "type": ["string", "null"],
+                    "enum": ["applied", "interview", "offer", "rejected", "withdrawn", None],
+                },
+            },
+            "required": ["job_title", "company_name", "job_link", "job_description", "status"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# System prompts, dedented once at import. Keeping them at module level
+# avoids re-shipping ~20% of the tokens as leading indentation on every
+# call and keeps the request bodies byte-stable for caching.
+_SYS_PROMPT_INTENT = textwrap.dedent("""
+    You classify user messages about tracking job applications.
+
+    Output ONLY the intent label, nothing else:
+    INTENT_TYPE ∈ {NEW_JOB, STATUS_UPDATE, JOB_SEARCH, JOB_DELETE, AMBIGUOUS, UNKNOWN}
+
+    Short definitions:
+    - NEW_JOB: user adds a new application (e.g., "I applied", shares a job link)
+    - STATUS_UPDATE: user reports a change or outcome (e.g., rejected/declined/passed, interview/phone screen/onsite, offer, withdrew)
+    - JOB_SEARCH: user wants to view/filter existing applications (e.g., "show my jobs", "applications at Google")
+    - JOB_DELETE: user wants to remove/delete job applications (e.g., "delete my rejected jobs", "remove this application", "clear my rejections")
+    - AMBIGUOUS: unclear or needs clarification
+    - UNKNOWN: unrelated to job tracking
+
+    Hints:
+    - If text mentions "applied" or includes a link → NEW_JOB
+    - Outcome/stage words → STATUS_UPDATE
+    - "show/list/view my jobs/applications" → JOB_SEARCH
+    - "delete/remove/clear" + jobs/applications → JOB_DELETE
+    - If both NEW_JOB and JOB_SEARCH cues appear, prefer NEW_JOB when a link is present; otherwise JOB_SEARCH
+""").strip()
+
+_SYS_PROMPT_SAFETY = textwrap.dedent("""
+            You are a safety classifier for a job-tracking assistant.
+            Decide if the user's message requests sensitive or unsafe information (e.g., internal IDs, environment variables, secrets, API keys, passwords, credentials, tokens, service keys, or confidential system data).
+            Output EXACTLY one line:
+            LABEL|CONFIDENCE|REASON
+            where LABEL ∈ {SAFE, UNSAFE} and CONFIDENCE ∈ [0,1]. Keep REASON short.
+""").strip()
+
+_SYS_PROMPT_JOB_RELATED = textwrap.dedent("""
+            You classify whether a user message is about job applications/tracking.
+            Output EXACTLY one line: LABEL|CONFIDENCE
+            LABEL ∈ {JOB, OTHER}; CONFIDENCE ∈ [0,1].
+            JOB covers adding applications, links to jobs, status changes, viewing/searching applications, 
+            interview anxiety, job search stress, confidence issues related to applications.
+            OTHER covers completely unrelated topics (weather, sports, random chat).
+""").strip()
+
+_SYS_PROMPT_EMOTION = textwrap.dedent("""
+            You analyze the emotional tone of a user's message about job applications.
+            Output EXACTLY one line: EMOTION|CONFIDENCE
+            EMOTION ∈ {confident, anxious, frustrated, disappointed, excited, neutral}
+            CONFIDENCE ∈ [0,1]
+            
+            - confident: positive, determined, ready to take action
+            - anxious: worried about interviews, uncertain, nervous
+            - frustrated: annoyed with process, AI not understanding, system issues  
+            - disappointed: sad about rejections, feeling down
+            - excited: happy about opportunities, interviews, offers
+            - neutral: matter-of-fact, just sharing information
+""").strip()
+
+_SYS_PROMPT_CLASSIFY_ALL = textwrap.dedent("""
+    You run three classifications of one user message for a job-tracking assistant.
+    Output EXACTLY three lines, in this order and format, nothing else:
+    SAFETY|LABEL|CONFIDENCE|REASON
+    JOB_RELATED|LABEL|CONFIDENCE
+    EMOTION|LABEL|CONFIDENCE
+
+    Line 1 — SAFETY: LABEL ∈ {SAFE, UNSAFE}. UNSAFE when the message requests
+    sensitive information (internal IDs, environment variables, secrets, API
+    keys, passwords, credentials, tokens, confidential system data). Keep
+    REASON short.
+    Line 2 — JOB_RELATED: LABEL ∈ {JOB, OTHER}. JOB covers adding
+    applications, job links, status changes, viewing/searching applications,
+    and job-search emotions; OTHER is unrelated topics.
+    Line 3 — EMOTION: LABEL ∈ {confident, anxious, frustrated, disappointed,
+    excited, neutral}.
+
+    CONFIDENCE ∈ [0,1] on every line.
+""").strip()
+
+_SYS_PROMPT_SMALLTALK = textwrap.dedent("""
+            You are JobTrackAI, a friendly and extremely witty assistant. The user sent small talk/off-topic or casual content.
+            Respond with funny or kind sentences depending on the user's message, then redirect to job-tracking options.
+            Try to keep it to 2 sentences.
+""").strip()
+
+_SYS_PROMPT_EXTRACT = textwrap.dedent("""
+            You are an AI assistant that extracts job information from user messages.
+            
+            Extract the following information if present:
+            - job_title: The job role/title
+            - company_name: The company name (be smart about casual mentions like "my google jobs", "amazon applications", "meta positions")
+            - job_link: URL to the job posting
+            - job_description: Brief description of the job
+            - status: One of [applied, interview, offer, rejected, withdrawn]
+            
+            Rules:
+            - If the user says they "applied" or shares a job link without a status, infer status = "applied".
+            - Map variations like "interviewing", "phone screen", "onsite" to "interview".
+            - Only output the five allowed status values when you include status.
+            - For search queries like "show my google jobs", "my amazon applications", extract the company name
+            - Company names should be properly capitalized (google -> Google, amazon -> Amazon, etc.)
+            - If information is not present, set to null.
+            
+            Examples:
+            - "show me my google jobs" -> company_name: "Google"
+            - "my amazon applications" -> company_name: "Amazon"  
+            - "meta positions" -> company_name: "Meta"
+            - "apple interviews" -> company_name: "Apple"
+            - "got rejected by google for the machine learning job" -> company_name: "Google", job_title: "Machine Learning Engineer", status: "rejected"
+            - "machine learning job" -> job_title: "Machine Learning Engineer"
+            - "ML Engineer" -> job_title: "Machine Learning Engineer"
+            
+            Respond with a JSON object containing only the extracted fields.
+""").strip()
+
+_SYS_PROMPT_RESPONSE = textwrap.dedent("""
+            You are JobTrackAI, a warm and encouraging assistant who helps users track job applications.
+            Tone: friendly, concise, supportive, never cheesy or overbearing.
+            Never expose internal IDs. Only mention fields in the jobs schema.
+            When listing jobs for the same company, use a numbered order.
+            Ask for clarification only for required fields that are still missing.
+""").strip()
+
+_SYS_PROMPT_JOB_LIST = textwrap.dedent("""
+            You are JobTrackAI, a warm and emotionally intelligent assistant. Create a personalized summary of job applications.
+            
+            Requirements:
+            - Do NOT invent or alter facts. Use only provided fields.
+            - Do NOT include internal IDs.
+            - Show each item as: "<index>. <job_title> — <company_name> [<status>]" and on the next indented line include "Link: <job_link>" if present.
+            - Be supportive and encouraging, but adapt tone to user's request and context
+            - If user asked for specific company/role, acknowledge their focused search
+            - End with a brief encouraging line that feels natural to the conversation
+            - Keep it conversational, not robotic
+""").strip()
+
+_SYS_PROMPT_JOB_CREATED = textwrap.dedent("""
+            You are JobTrackAI, a warm, emotionally intelligent assistant who genuinely celebrates job application milestones.
+            
+            Create a personalized confirmation for this newly added job application.
+            
+            Guidelines:
+            - Be genuinely excited and encouraging (but not over the top)
+            - Make it feel personal to their specific situation
+            - Use natural, conversational language (avoid robotic templates)
+            - Include 1 emoji max, and only if it feels natural
+            - If they seem excited, match their energy
+            - If they're just matter-of-fact, be supportive but not overly cheerful
+            - Reference specific details about the role/company when relevant
+            - Keep it concise but meaningful
+            - NO internal IDs or technical details
+            
+            Remember: This is a real person working toward their career goals. Make them feel heard and supported.
+""").strip()
+
+_SYS_PROMPT_STATUS_UPDATED = textwrap.dedent("""
+            You are JobTrackAI, a warm and emotionally intelligent assistant.
+            Create a personalized status update confirmation that feels natural and supportive.
+            
+            Tone guidelines based on status:
+            - rejected: Compassionate, validating, gently encouraging - acknowledge the disappointment but remind them of their worth
+            - withdrawn: Affirming - celebrate their decision-making and self-awareness
+            - interview: Excited and supportive - offer encouragement and confidence building
+            - offer: Celebratory - this is huge news, be genuinely excited for them
+            - applied: Supportive momentum - acknowledge their proactive effort
+            
+            Key principles:
+            - Match the user's tone and energy from their message
+            - Be genuine and conversational, not robotic
+            - Keep it concise but meaningful (1-2 sentences)
+            - Use 1 emoji max, and only if it feels natural
+            - Reference specific details when relevant
+            - No internal IDs or technical details
+""").strip()
+
+_SYS_PROMPT_FALLBACK = textwrap.dedent("""
+            You are JobTrackAI, a friendly assistant. The system needs a fallback reply.
+            Produce a concise, supportive, human message (1 emoji max) tailored to the intent provided.
+            - For JOB_SEARCH: invite the user to view or filter their applications.
+            - For STATUS_UPDATE: ask for the missing piece (job or status) as a single, clear question.
+            - For NEW_JOB: ask for the missing required fields (job_title and/or company_name) succinctly.
+            - For JOB_DELETE: ask what they want to delete (by status, company, etc.).
+            - For AMBIGUOUS/UNKNOWN: suggest a couple of helpful next actions.
+            Do not expose internal IDs.
+""").strip()
+
+_SYS_PROMPT_REFUSAL = textwrap.dedent("""
+            You are JobTrackAI, a gen-z assistant. The user asked for something sensitive or unsafe.
+            Respond with something witty and funny e.g: "Get your money up, not your funny up".
+            Do NOT expose internal IDs, environment variables, secrets, or any confidential data.
+            Try to keep it to 2-3 sentences.
+""").strip()
+
+_SYS_PROMPT_MISSING_FIELDS = textwrap.dedent("""
+            You are JobTrackAI, a friendly assistant. Ask for the missing required field(s) in a warm, concise way.
+            Rules:
+            - Restate any known fields succinctly.
+            - Ask ONLY for the specific missing fields by name.
+            - Keep tone supportive, 1 emoji max, no fluff.
+            - Do not expose internal IDs.
+            - Use short lines, no long paragraphs.
+""").strip()
+
+_SYS_PROMPT_ERROR = textwrap.dedent("""
+            You are JobTrackAI, a friendly assistant with a touch of humor. The user encountered an error.
+            Generate a friendly, supportive error message with these rules:
+            - Keep it concise (1-2 sentences)
+            - Add a touch of personality and wit (1 emoji max)
+            - Be encouraging and suggest a simple next step
+            - Do NOT expose technical details or internal IDs
+            - Match tone to error severity (light for minor issues, more serious for data problems)
+""").strip()
+
+_SYS_PROMPT_COMPLETENESS = textwrap.dedent("""
+            You are JobTrackAI, a job application tracking assistant. Your task is to analyze a conversation 
+            and determine if all required job details are present for creating a job entry.
+            
+            Required fields are:
+            - job_title: The title of the job position
+            - company_name: The name of the company offering the job
+            
+            Optional fields are:
+            - job_link: URL to the job posting
+            - job_description: Brief description of the job
+            - status: Current application status (default is APPLIED if a job link is present)
+            
+            Analyze the conversation history and the current extraction to:
+            1. Determine if the required fields are complete or can be inferred from context
+            2. For any missing required fields, check if they can be found in the conversation history
+            3. Return a JSON with complete fields, missing fields, and confidence score
+            
+            Rules:
+            - If a short reply (1-3 words) follows a request for a specific field, treat it as that field
+            - Company names are often short (e.g., "Google", "Microsoft", "Apple")
+            - Job titles can vary in length but are typically descriptive
+            - If a job link is present but other fields are missing, try to infer them from context
+            - Be confident (0.9+) only when fields are explicitly mentioned or clearly inferable
+""").strip()
+
+_SYS_PROMPT_INTERVIEW_PREP = textwrap.dedent("""
+            You are JobTrackAI, a supportive career coach. Generate practical interview prep advice.
+            
+            Provide 3-4 actionable tips specific to the role/company if available, or general interview advice.
+            Keep it encouraging and practical. Include:
+            - Research suggestions
+            - Common questions to prep
+            - One confidence-building tip
+            
+            Format as short bullet points, max 4 lines total.
+""").strip()
+
+_SYS_PROMPT_CLARIFICATION = textwrap.dedent("""
+            You are JobTrackAI, an intelligent assistant. The user mentioned a job update but there are multiple matches.
+            
+            Analyze their message to see if you can determine which job they mean without asking:
+            - Look for company names, job titles, or other identifying details
+            - Consider recent context if provided
+            - If truly ambiguous, ask in a friendly way with a short numbered list
+            
+            Be smart about context - don't ask if it's obvious which one they mean.
+            Always be personalized and natural - no robotic responses.
+""").strip()
+
+# Unified classifier prompt: the intent, safety, and job-related prompts are
+# concatenated behind a routing instruction so every classifier call shares
+# one system-prompt prefix. OpenAI caches long shared prefixes server-side,
+# discounting input tokens for each call after the first.
+_SYS_PROMPT_CLASSIFIER_UNIFIED = (
+    textwrap.dedent("""
+    You are a multi-mode classifier for a job-application tracking assistant.
+    The user message starts with a <MODE>...</MODE> tag. Follow ONLY the
+    section below matching that mode and ignore the others entirely.
+    """).strip()
+    + "\n\n### MODE: INTENT\n" + _SYS_PROMPT_INTENT
+    + "\n\n### MODE: SAFETY\n" + _SYS_PROMPT_SAFETY
+    + "\n\n### MODE: JOB_RELATED\n" + _SYS_PROMPT_JOB_RELATED
+)
+
+# Status keyword table for _normalize_status, hoisted to module scope. The
+# alternation regex (longest keyword first) matches every needle in one
+# C-level pass over the text instead of one `in` scan per keyword.
+_STATUS_MAPPING = {
+    "applied": JobStatus.APPLIED,
+    "apply": JobStatus.APPLIED,
+    "application": JobStatus.APPLIED,
+    "interview": JobStatus.INTERVIEW,
+    "interviewing": JobStatus.INTERVIEW,
+    "phone screen": JobStatus.INTERVIEW,
+    "screen": JobStatus.INTERVIEW,
+    "onsite": JobStatus.INTERVIEW,
+    "offer": JobStatus.OFFER,
+    "offered": JobStatus.OFFER,
+    "rejected": JobStatus.REJECTED,
+    "reject": JobStatus.REJECTED,
+    "declined by them": JobStatus.REJECTED,
+    "decline": JobStatus.REJECTED,
+    "withdrawn": JobStatus.WITHDRAWN,
+    "withdraw": JobStatus.WITHDRAWN,
+    "withdrew": JobStatus.WITHDRAWN,
+}
+_STATUS_KEYWORD_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(_STATUS_MAPPING, key=len, reverse=True))
+)
+# Hashed value->member table; JobStatus(value) iterates the enum and
+# raises on miss, a dict .get() does neither
+_STATUS_VALUES = {s.value: s for s in JobStatus}
+# Single compiled scan instead of two substring passes for link detection
+_URL_RE = re.compile(r"https?://")
+# Message-level phrasings that signal an application was just submitted,
+# matched in one alternation pass instead of one `in` scan per phrase
+_APPLIED_HINT_RE = re.compile(
+    r" i applied|i've applied|applied to|application submitted|"
+    r"submit(?:ted)? my application"
+)
+
+# Canonical (verb, object) extraction for the tier-2 intent cache. A tiny
+# keyword vocabulary stands in for full POS tagging: messages that reduce
+# to the same action pair ("show"/"job", "update"/"status") reuse one
+# cached classification regardless of surrounding phrasing.
+_CANONICAL_VERBS = {
+    "add": "add", "adding": "add", "added": "add", "create": "add", "track": "add",
+    "apply": "apply", "applied": "apply", "applying": "apply", "submitted": "apply",
+    "show": "show", "list": "show", "view": "show", "display": "show", "see": "show",
+    "find": "show", "search": "show",
+    "update": "update", "updated": "update", "change": "update", "changed": "update",
+    "set": "update", "mark": "update",
+    "delete": "delete", "remove": "delete", "clear": "delete",
+    "reject": "reject", "rejected": "reject",
+    "withdraw": "withdraw", "withdrew": "withdraw", "withdrawn": "withdraw",
+}
+_CANONICAL_OBJECTS = {
+    "job": "job", "jobs": "job", "position": "job", "positions": "job",
+    "role": "job", "roles": "job",
+    "application": "application", "applications": "application",
+    "status": "status", "statuses": "status",
+    "interview": "interview", "interviews": "interview",
+    "offer": "offer", "offers": "offer",
+    "rejection": "rejection", "rejections": "rejection",
+}
+
+# Pre-rendered confirmation templates keyed by status. Creating or updating
+# a job only needs a short supportive line with the title/company filled in;
+# substituting locally turns an LLM round-trip into an f-string. Unexpected
+# statuses still escape to the model.
+_CREATED_TEMPLATES = {
+    "applied": "Nice — added '{title}' at {company}, marked as applied. You've got this! ✨",
+    "interview": "Added '{title}' at {company} with an interview already lined up — exciting! 🎉",
+    "offer": "Added '{title}' at {company} at the offer stage — huge news! 🎉",
+    "rejected": "Logged '{title}' at {company} as rejected. Every 'no' gets you closer to the right 'yes' ❤️",
+    "withdrawn": "Added '{title}' at {company} as withdrawn. Knowing what you don't want counts too 👍",
+}
+# Pre-rendered asks for the common one-field-missing case in the add-job
+# flow; a short templated question reads the same as an LLM reply and
+# costs nothing. Two or more missing fields still go to the model.
+_MISSING_FIELD_TEMPLATES = {
+    "job_title": (
+        "Got it{company_part}! What's the job title? ✨",
+        "Nice{company_part} — which role did you apply for?",
+        "Almost there{company_part}! What position is this for?",
+    ),
+    "company_name": (
+        "Got it{title_part}! Which company is this at? ✨",
+        "Nice{title_part} — what's the company called?",
+        "Almost there{title_part}! Which company should I file this under?",
+    ),
+}
+_STATUS_UPDATED_TEMPLATES = {
+    "applied": "Updated '{title}' at {company} to applied — nice momentum! ✨",
+    "interview": "'{title}' at {company} moved to interview — you've earned this. Go show them! 🎉",
+    "offer": "An offer for '{title}' at {company}?! Huge congratulations! 🎉",
+    "rejected": "Marked '{title}' at {company} as rejected. That stings, but it doesn't define you ❤️",
+    "withdrawn": "Marked '{title}' at {company} as withdrawn — good call trusting your gut 👍",
+}
+
+# Deterministic cue patterns mirroring the classifier prompt's hints; when
+# one of these matches unambiguously the intent is resolved in microseconds
+# without any API call. Checked in precedence order (delete phrasing first,
+# since "delete my rejected jobs" also contains an outcome word).
+_DELETE_RE = re.compile(r"\b(delete|remove|clear)\b.{0,40}\b(jobs?|applications?|rejections?)\b", re.I)
+_NEWJOB_RE = re.compile(r"\b(i\s+applied|applied\s+to|new\s+job)\b|https?://", re.I)
+_STATUS_RE = re.compile(r"\b(rejected|turned\s+me\s+down|phone\s+screen|onsite|offer|withdrew|interview)\b", re.I)
+_SEARCH_RE = re.compile(r"\b(show|list|view)\s+(me\s+)?((my|the|all)\s+)?(jobs|applications)\b", re.I)
+# Job-tracking signal words that exempt a very short message from the
+# small-talk gate below
+_SHORT_JOB_HINT_RE = re.compile(r"https?://|\bjobs?\b|\bapplied\b|\bapplications?\b|\boffer\b|\binterview\b", re.I)
+# Pipe-delimited classifier replies ("LABEL|conf" / "LABEL|conf|reason")
+# parse with one DFA match instead of split/strip/float-try per field
+_PIPE2 = re.compile(r"^\s*([^|]*?)\s*\|\s*([\d.]+)\s*$")
+_PIPE3 = re.compile(r"^\s*([^|]*?)\s*\|\s*([\d.]+)\s*(?:\|\s*(.*?))?\s*$")
+# Fused-classifier lines: "TASK|LABEL|conf" with an optional trailing reason
+_FUSED_LINE_RE = re.compile(r"^\s*([^|]*?)\s*\|\s*([^|]*?)\s*\|\s*([\d.]+)\s*(?:\|\s*(.*?))?\s*$")
+# Household company names for the extraction fast path, mapped to their
+# canonical spellings (.title() would produce "Openai"/"Nvidia"). A short
+# status message mentioning one of these plus an outcome keyword is
+# unambiguous enough to skip the extraction LLM call entirely.
+_KNOWN_COMPANIES = {
+    "google": "Google", "amazon": "Amazon", "meta": "Meta",
+    "facebook": "Facebook", "apple": "Apple", "microsoft": "Microsoft",
+    "netflix": "Netflix", "stripe": "Stripe", "uber": "Uber",
+    "lyft": "Lyft", "airbnb": "Airbnb", "spotify": "Spotify",
+    "nvidia": "NVIDIA", "intel": "Intel", "salesforce": "Salesforce",
+    "shopify": "Shopify", "tesla": "Tesla", "openai": "OpenAI",
+}
+_KNOWN_COMPANY_RE = re.compile(
+    r"\b(" + "|".join(_KNOWN_COMPANIES) + r")\b",
+    re.I,
+)
+# Function/filler words that may surround a bare status phrase without
+# carrying extractable job details ("got rejected by google again"). Any
+# other residual word means the message holds content only the LLM can
+# pull out, so the fast path must stand down.
+_FAST_EXTRACT_FILLER = frozenset(
+    "i me my we they them a an the at by to from for of on in got get just "
+    "was were is am are be been have has had it its so and but with that "
+    "this there update news today yesterday unfortunately sadly finally "
+    "well ok okay hey hi yay ugh again".split()
+)
+_WORD_RE = re.compile(r"[a-z0-9']+")
+# Static emergency replies keyed by situation, used when OpenAI itself
+# is the thing that failed. The error path must never depend on a second
+# network call to the provider that just errored; the LLM only gets a
+# brief, bounded chance to phrase these better when it looks healthy.
+_FALLBACK_TABLE = {
+    "technical_error": (
+        "Hit a technical snag on my end — mind trying that again? 🔧",
+        "Something glitched on my side. One more try? ✨",
+    ),
+    "generic_failure": (
+        "That didn't go through — want to give it another shot?",
+        "Hmm, that one slipped past me. Try again? ✨",
+    ),
+    "refusal_fallback": (
+        "I can't help with that one, but I'm all in on your job hunt — what's next? 💪",
+    ),
+    "missing_fields_fallback": (
+        "I just need a couple more details — what's the job title and company?",
+    ),
+    "job_clarification": (
+        "A few of your jobs match that — which one did you mean?",
+    ),
+}
+_FALLBACK_DEFAULT = (
+    "Something went wrong, but I'm here to help! What would you like to do with your job applications? ✨",
+    "That didn't quite work, but let's keep going — what do you need? 💪",
+)
+
+# Shared personality header for the dynamic generators. One compact
+# paragraph instead of the bullet list formerly repeated into every
+# dynamic prompt: same behavioral content, a fraction of the input
+# tokens on each call.
+_BASE_PERSONALITY = (
+    "You are JobTrackAI, a warm, witty, emotionally intelligent job-application "
+    "assistant. Be genuinely supportive, conversational (never robotic), adapt "
+    "to the user's emotional state, keep replies concise, personalize from "
+    "context, and never expose internal system details."
+)
+
+# Situation-specific prompt templates for generate_dynamic_response,
+# built once at import. Only the selected template is formatted per call
+# ({base}/{type}/{context} placeholders), instead of interpolating all
+# twelve f-strings every invocation.
+_DYNAMIC_PROMPT_TEMPLATES = {
+    "status_missing": textwrap.dedent("""\
+        {base}
+
+        The user wants to update a job status but didn't specify which status.
+        Context: {context}
+
+        Ask them for the new status in a friendly, natural way. The options are:
+        applied, interview, offer, rejected, withdrawn
+
+        Make it feel like a conversation, not a form."""),
+    "no_jobs_found": textwrap.dedent("""\
+        {base}
+
+        The user has no job applications yet.
+        Context: {context}
+
+        Encourage them to add their first job application in a supportive way.
+        Make them feel like they're starting an exciting journey."""),
+    "job_creation_failed": textwrap.dedent("""\
+        {base}
+
+        We couldn't create a job entry for technical reasons.
+        Context: {context}
+
+        Acknowledge the issue gracefully and suggest trying again.
+        Be reassuring - it's not their fault."""),
+    "job_not_found": textwrap.dedent("""\
+        {base}
+
+        The user tried to update a job that doesn't exist in their list.
+        Context: {context}
+
+        Gently let them know we couldn't find that job, and offer to help them add it or find the right one."""),
+    "job_not_found_with_clarification": textwrap.dedent("""\
+        {base}
+
+        The user tried to update a job that doesn't exist in their list.
+        Context: {context}
+
+        Be helpful and transparent:
+        1. Explain what we searched for specifically
+        2. Show them what jobs they DO have (if any)
+        3. Ask clear questions: "Did you mean one of these jobs?" or "Should I add this as a new job?"
+        4. Be empathetic to their situation"""),
+    "bulk_confirmation": textwrap.dedent("""\
+        {base}
+
+        The user wants to update all their jobs to the same status.
+        Context: {context}
+
+        Ask for confirmation in a way that shows the impact.
+        Make sure they really want to do this."""),
+    "generic_error": textwrap.dedent("""\
+        {base}
+
+        Something went wrong but we don't want to expose technical details.
+        Context: {context}
+
+        Acknowledge the hiccup gracefully and suggest next steps.
+        Stay positive and helpful."""),
+    "status_updated_with_confirmation": textwrap.dedent("""\
+        {base}
+
+        A job status was automatically updated in the database.
+        Context: {context}
+
+        IMPORTANT: You must clearly tell the user what was changed:
+        - Which specific job was updated
+        - What the status changed from and to
+        - Acknowledge their emotional state appropriately
+
+        Be transparent about the action taken while remaining supportive."""),
+    "no_jobs_to_delete": textwrap.dedent("""\
+        {base}
+
+        The user wants to delete jobs but no jobs match their criteria.
+        Context: {context}
+
+        Gently let them know there are no jobs to delete matching their specified criteria.
+        Be specific about what they're looking for (status, company, etc.)
+        Offer to show what jobs they do have or help with other actions."""),
+    "delete_confirmation": textwrap.dedent("""\
+        {base}
+
+        The user wants to delete multiple jobs and we need confirmation.
+        Context: {context}
+
+        IMPORTANT: Show them exactly what will be deleted and ask for clear confirmation.
+        - List the specific jobs that will be deleted
+        - Make it clear this action cannot be undone
+        - Ask for explicit "yes" or "no" confirmation
+        Be supportive but make sure they understand the consequences."""),
+    "delete_clarification_needed": textwrap.dedent("""\
+        {base}
+
+        The user wants to delete jobs but wasn't specific about which ones.
+        Context: {context}
+
+        Help them clarify:
+        - Ask what criteria they want to use (status, company, etc.)
+        - Give examples like "rejected jobs" or "applications at Google"
+        - Be helpful and supportive"""),
+    "deletion_completed": textwrap.dedent("""\
+        {base}
+
+        Jobs have been successfully deleted from the database.
+        Context: {context}
+
+        Confirm what was deleted and be supportive:
+        - Tell them exactly how many jobs were deleted
+        - Acknowledge this helps clean up their application list
+        - Offer next steps like viewing remaining jobs"""),
+    "deletion_failed": textwrap.dedent("""\
+        {base}
+
+        Job deletion failed for some reason.
+        Context: {context}
+
+        Acknowledge the issue and offer alternatives:
+        - Explain that the deletion couldn't be completed
+        - Suggest trying again or checking what jobs they have
+        - Be helpful and reassuring"""),
+}
+_DYNAMIC_PROMPT_DEFAULT = textwrap.dedent("""\
+    {base}
+
+    Generate a response for: {type}
+    Context: {context}
+
+    Be natural, helpful, and personalized to the situation.""")
+
+_SEED_EXAMPLES: Dict[IntentType, tuple] = {
+    IntentType.NEW_JOB: (
+        "i applied to a software engineer role at google",
+        "just applied for a new job",
+        "adding a new application",
+        "i submitted my application to stripe today",
+        "here's a job posting i applied to https://example.com/job",
+    ),
+    IntentType.STATUS_UPDATE: (
+        "they rejected me",
+        "i got an interview at amazon",
+        "the recruiter scheduled a phone screen",
+        "i received an offer",
+        "i withdrew my application",
+        "update the status of my meta application",
+    ),
+    IntentType.JOB_SEARCH: (
+        "show my jobs",
+        "list my applications",
+        "what jobs have i applied to",
+        "show me my google applications",
+        "view my rejected applications",
+    ),
+    IntentType.JOB_DELETE: (
+        "delete my rejected jobs",
+        "remove this application",
+        "clear my rejections",
+        "delete all my withdrawn applications",
+    ),
+}
+
 class OpenAIService:
     """Service for OpenAI API interactions"""
-    
+
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=_shared_http)
         self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # Default model for cost/speed balance
-        
+        # Cosmetic (non-blocking-tone) responses can run on a cheaper model
+        # and/or OpenAI's flex service tier; both default to the main setup.
+        self.flex_model = os.getenv("OPENAI_FLEX_MODEL", self.model)
+        # Label-only classifier calls don't need the main model's capability;
+        # route them to the cheapest model that solves the task
+        self.classify_model = os.getenv("OPENAI_CLASSIFY_MODEL", "gpt-4.1-nano")
+        self.flex_service_tier = os.getenv("OPENAI_FLEX_SERVICE_TIER")
+        # Bound in-flight API calls so load spikes queue here instead of
+        # exhausting the connection pool or tripping provider rate limits
+        self._api_semaphore = asyncio.Semaphore(int(os.getenv("OPENAI_MAX_CONCURRENCY", "20")))
+        # Exact-match LRU cache for deterministic (classifier) completions.
+        # Keyed by a digest of model + prompts; creative generate_friendly_*
+        # calls bypass it so repeated confirmations don't all read the same.
+        self._completion_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._completion_cache_lock = asyncio.Lock()
+        # In-flight futures keyed like the cache, so concurrent identical
+        # requests piggyback on one API call instead of racing it
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self.embedding_model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+        # Paraphrases of already-classified messages resolve here with one
+        # cheap embedding call instead of a chat completion; seeded lazily
+        # from _SEED_EXAMPLES
+        self._intent_cache = SemanticCache()
+        self._seeds_attempted = False
+        # Tier-2 intent cache keyed by canonical (verb, object) pairs; the
+        # key space is the small _CANONICAL_* vocabulary so no bound needed
+        self._canonical_cache: Dict[Tuple[str, str], Tuple[IntentType, float]] = {}
+        # Paraphrase cache for the fused safety/job-related/emotion result;
+        # near-duplicate messages skip the classify_all completion entirely
+        self._fused_cache = SemanticCache()
+        # Tiny exact memo so classify_intent and classify_all don't embed
+        # the same inbound message twice
+        self._embedding_memo: "OrderedDict[str, array]" = OrderedDict()
+        # Per-model API telemetry (call count, wall time, token usage) so
+        # optimization work can target the calls that actually dominate
+        self._api_stats: Dict[str, Dict[str, float]] = {}
+        # Monotonic deadline before which the provider is assumed down
+        # (set when the backoff wrapper exhausts its retries), so error
+        # paths answer from static text instead of a second doomed call
+        self._unhealthy_until = 0.0
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters for the exact-match completion cache."""
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._completion_cache),
+        }
+
+    def api_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-model call counts, cumulative latency, and token usage."""
+        return {model: dict(stats) for model, stats in self._api_stats.items()}
+
+    def _cache_key(self, system_prompt: str, user_message: str, model: Optional[str] = None, temperature: float = 0.1) -> str:
+        """Digest of model + sampling temperature + prompts; user text is
+        normalized so trivial whitespace/case variants share an entry."""
+        normalized = user_message.strip().lower()
+        payload = f"{model or self.model}|{temperature}|{system_prompt}|{normalized}"
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    async def _embed_message(self, message: str) -> Optional[array]:
+        """Embed a message and L2-normalize it, or None when the API fails.
+
+        The most recent vectors are memoized so the intent and fused
+        classifiers share one embedding call per inbound message.
+        """
+        memo_key = message.strip().lower()
+        cached = self._embedding_memo.get(memo_key)
+        if cached is not None:
+            self._embedding_memo.move_to_end(memo_key)
+            return cached
+        try:
+            response = await self.client.embeddings.create(model=self.embedding_model, input=message)
+            vector = array("f", response.data[0].embedding)
+            norm = sum(x * x for x in vector) ** 0.5
+            if norm == 0:
+                return None
+            normalized = array("f", (x / norm for x in vector))
+            self._embedding_memo[memo_key] = normalized
+            while len(self._embedding_memo) > 256:
+                self._embedding_memo.popitem(last=False)
+            return normalized
+        except Exception as e:
+            logger.warning("Embedding call failed: %s", e)
+            return None
+
+    @staticmethod
+    def _canonicalize(message: str) -> Optional[Tuple[str, str]]:
+        """Reduce a message to its canonical (verb, object) pair, or None
+        when either is missing from the known vocabulary."""
+        verb = obj = None
+        for word in re.findall(r"[a-z']+", message.lower()):
+            if verb is None:
+                verb = _CANONICAL_VERBS.get(word)
+            if obj is None:
+                obj = _CANONICAL_OBJECTS.get(word)
+            if verb is not None and obj is not None:
+                return verb, obj
+        return None
+
+    @staticmethod
+    def _fast_classify(message: str) -> Optional[tuple[IntentType, float]]:
+        """Resolve the intent from unambiguous textual cues, or None."""
+        if _DELETE_RE.search(message):
+            return IntentType.JOB_DELETE, 0.95
+        if _NEWJOB_RE.search(message):
+            # Prompt tie-break: when both NEW_JOB and JOB_SEARCH cues appear,
+            # NEW_JOB wins only if a link is present; otherwise JOB_SEARCH
+            # ("show me the jobs i applied to" is a view request)
+            if _URL_RE.search(message) or not _SEARCH_RE.search(message):
+                return IntentType.NEW_JOB, 0.95
+            return IntentType.JOB_SEARCH, 0.95
+        if _STATUS_RE.search(message):
+            return IntentType.STATUS_UPDATE, 0.9
+        if _SEARCH_RE.search(message):
+            return IntentType.JOB_SEARCH, 0.95
+        return None
+
+    async def _ensure_seed_examples(self) -> None:
+        """Embed the labeled seed examples once (single batched API call)."""
+        if self._seeds_attempted:
+            return
+        self._seeds_attempted = True
+        phrases = [(intent, text) for intent, texts in _SEED_EXAMPLES.items() for text in texts]
+        try:
+            response = await self.client.embeddings.create(
+                model=self.embedding_model,
+                input=[text for _, text in phrases],
+            )
+            for (intent, _), item in zip(phrases, response.data):
+                vector = array("f", item.embedding)
+                norm = sum(x * x for x in vector) ** 0.5
+                if norm == 0:
+                    continue
+                vector = array("f", (x / norm for x in vector))
+                self._intent_cache.add_seed(vector, (intent, _SEED_EXAMPLE_CONFIDENCE))
+        except Exception as e:
+            logger.warning("Seed example embedding failed: %s", e)
+
     async def classify_intent(self, message: str) -> tuple[IntentType, float]:
         """
         Classify the intent of a user message
         Returns: (intent_type, confidence_score)
         """
+        fast = self._fast_classify(message)
+        if fast is not None:
+            return fast
+        canonical = self._canonicalize(message)
+        if canonical is not None and canonical in self._canonical_cache:
+            return self._canonical_cache[canonical]
+        # One-or-two-word messages without any job signal ("hi", "ok",
+        # "thanks") are overwhelmingly small talk; don't spend API calls
+        if len(message.split()) <= 2 and not _SHORT_JOB_HINT_RE.search(message):
+            return IntentType.UNKNOWN, 0.3
+        query_embedding = None
         try:
-            system_prompt = """
-            You are an AI assistant that classifies user messages about tracking job applications.
-            
-            Output ONLY one line in this exact format:
-            INTENT_TYPE|CONFIDENCE
-            
-            INTENT_TYPE ∈ {NEW_JOB, STATUS_UPDATE, JOB_SEARCH, AMBIGUOUS, UNKNOWN}
-            
-            Hints:
-            - NEW_JOB if text but not limited to contains phrases like: "i applied", "applied to", "new job", or includes a job link.
-            - STATUS_UPDATE for phrases but not limited to phrases like: "rejected", "rejected me", "they passed", "turned me down", "didn't make it", "no longer moving forward", "got an interview", "phone screen", "onsite", "offer", "withdrew", "update status", "status update", "status change", "status changed", "status updated", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status updated to", "status
-            - JOB_SEARCH but not limited to contains phrases like "show my jobs", "my applications", "list jobs", "what jobs".
-            - If both NEW_JOB and JOB_SEARCH cues appear, prefer NEW_JOB when a link is present; otherwise JOB_SEARCH.
-            - Confidence ∈ [0,1].
-            """
-            # override with a concise, graceful prompt
-            system_prompt = """
-            You classify user messages about tracking job applications.
-            
-            Output ONLY one line in this exact format:
-            INTENT_TYPE|CONFIDENCE
-            
-            INTENT_TYPE ∈ {NEW_JOB, STATUS_UPDATE, JOB_SEARCH, JOB_DELETE, AMBIGUOUS, UNKNOWN}
-            
-            Short definitions:
-            - NEW_JOB: user adds a new application (e.g., "I applied", shares a job link)
-            - STATUS_UPDATE: user reports a change or outcome (e.g., rejected/declined/passed, interview/phone screen/onsite, offer, withdrew)
-            - JOB_SEARCH: user wants to view/filter existing applications (e.g., "show my jobs", "applications at Google")
-            - JOB_DELETE: user wants to remove/delete job applications (e.g., "delete my rejected jobs", "remove this application", "clear my rejections")
-            - AMBIGUOUS: unclear or needs clarification
-            - UNKNOWN: unrelated to job tracking
-            
-            Hints:
-            - If text mentions "applied" or includes a link → NEW_JOB
-            - Outcome/stage words → STATUS_UPDATE
-            - "show/list/view my jobs/applications" → JOB_SEARCH
-            - "delete/remove/clear" + jobs/applications → JOB_DELETE
-            - If both NEW_JOB and JOB_SEARCH cues appear, prefer NEW_JOB when a link is present; otherwise JOB_SEARCH
-            
-            Confidence ∈ [0,1].
-            """
-            
-            response = await self._get_chat_completion(
-                system_prompt=system_prompt,
-                user_message=message
+            await self._ensure_seed_examples()
+            query_embedding = await self._embed_message(message)
+            if query_embedding is not None:
+                cached = self._intent_cache.lookup(query_embedding)
+                if cached is not None:
+                    logger.info("Semantic cache hit for intent classification")
+                    return cached
+            label, confidence = await self._get_label_completion(
+                system_prompt=_SYS_PROMPT_CLASSIFIER_UNIFIED,
+                user_message=f"<MODE>INTENT</MODE>\n{message}"
             )
             
-            # Parse response
-            logger.info(f"Raw AI response: {response}")
-            
-            if response and "|" in response:
-                intent_str, confidence_str = response.split("|")
-                intent_str = intent_str.strip().upper()
-                confidence_str = confidence_str.strip()
-                
-                logger.info(f"Parsed intent: '{intent_str}', confidence: '{confidence_str}'")
-                
-                # Try to match the intent
-                try:
-                    # First try exact match
-                    intent = IntentType(intent_str)
-                except ValueError:
-                    # Try removing underscores
-                    intent_str_clean = intent_str.replace('_', '')
-                    try:
-                        intent = IntentType(intent_str_clean)
-                    except ValueError:
-                        # Try common variations
-                        intent_mapping = {
-                            'NEWJOB': IntentType.NEW_JOB,
-                            'STATUSUPDATE': IntentType.STATUS_UPDATE,
-                            'JOBSEARCH': IntentType.JOB_SEARCH,
-                            'AMBIGUOUS': IntentType.AMBIGUOUS,
-                            'UNKNOWN': IntentType.UNKNOWN
-                        }
-                        intent = intent_mapping.get(intent_str, IntentType.UNKNOWN)
-                
-                try:
-                    confidence = float(confidence_str)
-                    return intent, confidence
-                except ValueError:
-                    logger.warning(f"Invalid confidence score: {confidence_str}")
-                    return intent, 0.8  # Default confidence
+            logger.info("Raw AI response: %s (confidence %.3f)", label, confidence)
+            
+            if label:
+                intent_str = label.strip().upper()
+                intent = _INTENT_ALIASES.get(intent_str.replace('_', ''), IntentType.UNKNOWN)
+                if intent != IntentType.UNKNOWN:
+                    if canonical is not None:
+                        self._canonical_cache[canonical] = (intent, confidence)
+                    if query_embedding is not None:
+                        self._intent_cache.store(query_embedding, (intent, confidence))
+                return intent, confidence
             else:
-                logger.warning(f"Unexpected response format: {response}")
+                logger.warning(f"Unexpected response format: {label}")
                 return IntentType.UNKNOWN, 0.0
                 
         except Exception as e:
@@ -126,24 +922,12 @@ class OpenAIService:
         Returns: (is_unsafe, confidence, reason)
         """
         try:
-            system_prompt = """
-            You are a safety classifier for a job-tracking assistant.
-            Decide if the user's message requests sensitive or unsafe information (e.g., internal IDs, environment variables, secrets, API keys, passwords, credentials, tokens, service keys, or confidential system data).
-            Output EXACTLY one line:
-            LABEL|CONFIDENCE|REASON
-            where LABEL ∈ {SAFE, UNSAFE} and CONFIDENCE ∈ [0,1]. Keep REASON short.
-            """
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=message)
-            if res and "|" in res:
-                parts = res.split("|", 2)
-                if len(parts) == 3:
-                    label = parts[0].strip().upper()
-                    try:
-                        conf = float(parts[1].strip())
-                    except Exception:
-                        conf = 0.8
-                    reason = parts[2].strip()
-                    return (label == "UNSAFE", conf, reason)
+            system_prompt = _SYS_PROMPT_CLASSIFIER_UNIFIED
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=f"<MODE>SAFETY</MODE>\n{message}", cache=True, max_tokens=32, stop=["\n"], model=self.classify_model, temperature=0.0)
+            m = _PIPE3.match(res) if res else None
+            if m:
+                label, conf, reason = m.group(1).upper(), float(m.group(2)), m.group(3) or ""
+                return (label == "UNSAFE", conf, reason)
             return (False, 0.0, "")
         except Exception as e:
             logger.error(f"Safety detection error: {e}")
@@ -154,53 +938,105 @@ class OpenAIService:
         Returns: (is_job_related, confidence)
         """
         try:
-            system_prompt = """
-            You classify whether a user message is about job applications/tracking.
-            Output EXACTLY one line: LABEL|CONFIDENCE
-            LABEL ∈ {JOB, OTHER}; CONFIDENCE ∈ [0,1].
-            JOB covers adding applications, links to jobs, status changes, viewing/searching applications, 
-            interview anxiety, job search stress, confidence issues related to applications.
-            OTHER covers completely unrelated topics (weather, sports, random chat).
-            """
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=message)
-            if res and "|" in res:
-                lbl, conf = res.split("|", 1)
-                lbl = lbl.strip().upper()
-                try:
-                    return (lbl == "JOB", float(conf.strip()))
-                except Exception:
-                    return (lbl == "JOB", 0.8)
+            system_prompt = _SYS_PROMPT_CLASSIFIER_UNIFIED
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=f"<MODE>JOB_RELATED</MODE>\n{message}", cache=True, max_tokens=12, stop=["\n"], model=self.classify_model, temperature=0.0)
+            m = _PIPE2.match(res) if res else None
+            if m:
+                return (m.group(1).upper() == "JOB", float(m.group(2)))
             return (False, 0.0)
         except Exception as e:
             logger.error(f"Job-related detection error: {e}")
             return (False, 0.0)
 
+    async def triage(
+        self, message: str
+    ) -> tuple[tuple[bool, float, str], tuple[bool, float], tuple[IntentType, float]]:
+        """Run the safety, job-related, and intent classifiers concurrently.
+
+        The three checks are independent, so firing them with asyncio.gather
+        costs one round-trip of wall time instead of three.
+        Returns: (unsafe_result, job_related_result, intent_result)
+        """
+        return await asyncio.gather(
+            self.detect_unsafe_request(message),
+            self.detect_job_related(message),
+            self.classify_intent(message),
+        )
+
+    async def analyze_message(self, message: str) -> tuple[tuple[IntentType, float], JobExtraction]:
+        """Classify intent and extract job details concurrently.
+
+        Both calls depend only on the raw message, so overlapping them with
+        asyncio.gather costs one round-trip of wall time instead of two.
+        Returns: ((intent, confidence), extraction)
+        """
+        intent_result, extraction = await asyncio.gather(
+            self.classify_intent(message),
+            self.extract_job_details(message),
+        )
+        return intent_result, extraction
+
+    async def classify_all(self, message: str) -> Dict[str, tuple]:
+        """Run the safety, job-related, and emotion classifiers in ONE completion.
+
+        The three checks previously cost one round-trip each; a fused prompt
+        answers all of them in a single call. Intent stays on its own tiered
+        path (regex/canonical/semantic caches with logprob confidence).
+        Returns: {"unsafe": (bool, conf, reason),
+                  "job_related": (bool, conf),
+                  "emotion": (label, conf)}
+        """
+        result = {
+            "unsafe": (False, 0.0, ""),
+            "job_related": (False, 0.0),
+            "emotion": ("neutral", 0.5),
+        }
+        try:
+            # Paraphrases of an already-classified message resolve from the
+            # semantic cache with one cheap embedding instead of a completion
+            query_embedding = await self._embed_message(message)
+            if query_embedding is not None:
+                cached = self._fused_cache.lookup(query_embedding)
+                if cached is not None:
+                    logger.info("Semantic cache hit for fused classification")
+                    return cached
+            res = await self._get_chat_completion(
+                system_prompt=_SYS_PROMPT_CLASSIFY_ALL,
+                user_message=message,
+                cache=True,
+                max_tokens=64,
+                model=self.classify_model,
+                temperature=0.0,
+            )
+            for line in (res or "").splitlines():
+                m = _FUSED_LINE_RE.match(line)
+                if not m:
+                    continue
+                task, label, conf_str, reason = m.groups()
+                conf = float(conf_str)
+                task = task.upper()
+                if task == "SAFETY":
+                    result["unsafe"] = (label.upper() == "UNSAFE", conf, reason or "")
+                elif task == "JOB_RELATED":
+                    result["job_related"] = (label.upper() == "JOB", conf)
+                elif task == "EMOTION":
+                    result["emotion"] = (label.lower(), conf)
+            if res and query_embedding is not None:
+                self._fused_cache.store(query_embedding, result)
+        except Exception as e:
+            logger.error(f"Fused classification error: {e}")
+        return result
+
     async def detect_emotional_state(self, message: str) -> tuple[str, float]:
         """Detect user's emotional state for appropriate response tone.
         Returns: (emotion, confidence) where emotion ∈ {confident, anxious, frustrated, disappointed, excited}
         """
         try:
-            system_prompt = """
-            You analyze the emotional tone of a user's message about job applications.
-            Output EXACTLY one line: EMOTION|CONFIDENCE
-            EMOTION ∈ {confident, anxious, frustrated, disappointed, excited, neutral}
-            CONFIDENCE ∈ [0,1]
-            
-            - confident: positive, determined, ready to take action
-            - anxious: worried about interviews, uncertain, nervous
-            - frustrated: annoyed with process, AI not understanding, system issues  
-            - disappointed: sad about rejections, feeling down
-            - excited: happy about opportunities, interviews, offers
-            - neutral: matter-of-fact, just sharing information
-            """
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=message)
-            if res and "|" in res:
-                emotion, conf = res.split("|", 1)
-                emotion = emotion.strip().lower()
-                try:
-                    return (emotion, float(conf.strip()))
-                except Exception:
-                    return (emotion, 0.8)
+            system_prompt = _SYS_PROMPT_EMOTION
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=message, cache=True, max_tokens=12, stop=["\n"], model=self.classify_model, temperature=0.0)
+            m = _PIPE2.match(res) if res else None
+            if m:
+                return (m.group(1).lower(), float(m.group(2)))
             return ("neutral", 0.5)
         except Exception as e:
             logger.error(f"Emotional state detection error: {e}")
@@ -222,7 +1058,7 @@ class OpenAIService:
             
             Keep it genuine, 1-2 sentences max, and always offer actionable next steps.
             """
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=f"User said: {message}")
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=f"User said: {message}", max_tokens=100)
             if res:
                 return res
         except Exception as e:
@@ -235,83 +1071,57 @@ class OpenAIService:
             return "I hear you - job searching can be rough. Let me be more helpful - what do you need right now? ✊"
         elif emotion == "disappointed":
             return "Rejections suck, but they don't define your worth. Every 'no' gets you closer to the right 'yes' ❤️"
-        else:
-            return "I'm here to help make this easier. What can I do for you? ✨"
-
-    async def generate_smalltalk_redirect(self, message: str) -> str:
-        """Friendly, brief small-talk response that redirects to job-tracking actions."""
-        try:
-            system_prompt = """
-            You are JobTrackAI, a friendly and extremely witty assistant. The user sent small talk/off-topic or casual content.
-            Respond with funny or kind sentences depending on the user's message, then redirect to job-tracking options.
-            Try to keep it to 2 sentences.
-            """
-            user_msg = f"Small talk from user: {message}\nCreate a friendly redirect."
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
-            if res:
-                return res
-        except Exception as e:
-            logger.error(f"Smalltalk redirect error: {e}")
-        return "Got it! I’m here to help with your job search — want to add a job, update a status, or see your applications? ✨"
-    
-    async def extract_job_details(self, message: str) -> JobExtraction:
-        """
-        Extract job details from user message, including normalized status
-        """
-        try:
-            system_prompt = """
-            You are an AI assistant that extracts job information from user messages.
-            
-            Extract the following information if present:
-            - job_title: The job role/title
-            - company_name: The company name (be smart about casual mentions like "my google jobs", "amazon applications", "meta positions")
-            - job_link: URL to the job posting
-            - job_description: Brief description of the job
-            - status: One of [applied, interview, offer, rejected, withdrawn]
-            
-            Rules:
-            - If the user says they "applied" or shares a job link without a status, infer status = "applied".
-            - Map variations like "interviewing", "phone screen", "onsite" to "interview".
-            - Only output the five allowed status values when you include status.
-            - For search queries like "show my google jobs", "my amazon applications", extract the company name
-            - Company names should be properly capitalized (google -> Google, amazon -> Amazon, etc.)
-            - If information is not present, set to null.
-            
-            Examples:
-            - "show me my google jobs" -> company_name: "Google"
-            - "my amazon applications" -> company_name: "Amazon"  
-            - "meta positions" -> company_name: "Meta"
-            - "apple interviews" -> company_name: "Apple"
-            - "got rejected by google for the machine learning job" -> company_name: "Google", job_title: "Machine Learning Engineer", status: "rejected"
-            - "machine learning job" -> job_title: "Machine Learning Engineer"
-            - "ML Engineer" -> job_title: "Machine Learning Engineer"
-            
-            Respond with a JSON object containing only the extracted fields.
-            """
+        else:
+            return "I'm here to help make this easier. What can I do for you? ✨"
+
+    async def generate_smalltalk_redirect(self, message: str) -> str:
+        """Friendly, brief small-talk response that redirects to job-tracking actions."""
+        try:
+            system_prompt = _SYS_PROMPT_SMALLTALK
+            user_msg = f"Small talk from user: {message}\nCreate a friendly redirect."
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, priority="flex", max_tokens=80)
+            if res:
+                return res
+        except Exception as e:
+            logger.error(f"Smalltalk redirect error: {e}")
+        return "Got it! I’m here to help with your job search — want to add a job, update a status, or see your applications? ✨"
+    
+    async def extract_job_details(self, message: str) -> JobExtraction:
+        """
+        Extract job details from user message, including normalized status
+        """
+        try:
+            # Fast path: short status-only messages ("got rejected by google")
+            # are fully covered by the keyword tables the prompt's own Hints
+            # enumerate — resolve them locally instead of paying an LLM call.
+            fast = self._fast_extract(message)
+            if fast is not None:
+                return fast
+
+            system_prompt = _SYS_PROMPT_EXTRACT
             
             response = await self._get_chat_completion(
                 system_prompt=system_prompt,
-                user_message=message
+                user_message=message,
+                response_format=_JOB_EXTRACTION_FORMAT,
+                cache=True,
+                max_tokens=200,
+                temperature=0.0
             )
             
-            # Parse JSON response
+            # Structured outputs guarantee a conforming JSON object
             try:
                 if response:
-                    # Try to extract JSON from response
-                    if '{' in response and '}' in response:
-                        start = response.find('{')
-                        end = response.rfind('}') + 1
-                        json_str = response[start:end]
-                        data = json.loads(json_str)
-                        status_value = self._normalize_status(data.get('status'), original_message=message)
-                        return JobExtraction(
-                            job_title=(data.get('job_title') or None),
-                            company_name=(data.get('company_name') or None),
-                            job_link=(data.get('job_link') or None),
-                            job_description=(data.get('job_description') or None),
-                            status=status_value,
-                            confidence=0.8  # Default confidence for successful extraction
-                        )
+                    data = json.loads(response)
+                    status_value = self._normalize_status(data.get('status'), original_message=message)
+                    return JobExtraction(
+                        job_title=(data.get('job_title') or None),
+                        company_name=(data.get('company_name') or None),
+                        job_link=(data.get('job_link') or None),
+                        job_description=(data.get('job_description') or None),
+                        status=status_value,
+                        confidence=0.8  # Default confidence for successful extraction
+                    )
             except (json.JSONDecodeError, KeyError) as e:
                 logger.warning(f"Failed to parse JSON response: {e}")
             
@@ -329,24 +1139,52 @@ class OpenAIService:
             logger.error(f"Error extracting job details: {str(e)}")
             return JobExtraction(confidence=0.0)
     
+    def _fast_extract(self, message: str) -> Optional[JobExtraction]:
+        """Regex-only extraction for unambiguous short status updates.
+
+        Returns a JobExtraction when the message contains a status keyword,
+        no link, and little enough text that there is nothing else for the
+        LLM to pull out; returns None to fall through to the model.
+        """
+        if len(message.split()) > 10 or _URL_RE.search(message):
+            return None
+        status = self._normalize_status(message, original_message=message)
+        if status is None:
+            return None
+        company_match = _KNOWN_COMPANY_RE.search(message)
+        # Only short-circuit when the message is essentially just the status
+        # phrase. Residual content words ("...as a software engineer",
+        # "...for the machine learning job") are fields this regex tier
+        # cannot capture; dropping them would make the agent re-ask for
+        # details the user already typed, so fall through to the LLM.
+        residual = message.lower()
+        residual = _APPLIED_HINT_RE.sub(" ", residual)
+        residual = _STATUS_KEYWORD_RE.sub(" ", residual)
+        residual = _KNOWN_COMPANY_RE.sub(" ", residual)
+        if any(w not in _FAST_EXTRACT_FILLER for w in _WORD_RE.findall(residual)):
+            return None
+        return JobExtraction(
+            job_title=None,
+            company_name=_KNOWN_COMPANIES[company_match.group(0).lower()] if company_match else None,
+            job_link=None,
+            job_description=None,
+            status=status,
+            confidence=0.9,
+        )
+
     async def generate_response(self, message: str, context: str = "") -> str:
         """
         Generate a natural language response to user message
         """
         try:
-            system_prompt = """
-            You are JobTrackAI, a warm and encouraging assistant who helps users track job applications.
-            Tone: friendly, concise, supportive, never cheesy or overbearing.
-            Never expose internal IDs. Only mention fields in the jobs schema.
-            When listing jobs for the same company, use a numbered order.
-            Ask for clarification only for required fields that are still missing.
-            """
+            system_prompt = _SYS_PROMPT_RESPONSE
             
             user_prompt = f"Context: {context}\n\nUser message: {message}"
             
             response = await self._get_chat_completion(
                 system_prompt=system_prompt,
-                user_message=user_prompt
+                user_message=user_prompt,
+                max_tokens=400
             )
             
             return response or await self.generate_dynamic_fallback("generic_failure", {"context": context})
@@ -355,6 +1193,33 @@ class OpenAIService:
             logger.error(f"Error generating response: {str(e)}")
             return await self.generate_dynamic_fallback("technical_error", {"error": str(e)})
 
+    async def generate_response_stream(self, message: str, context: str = "") -> AsyncIterator[str]:
+        """Stream a natural language response token-by-token.
+
+        Yields content chunks as they arrive so callers can start rendering
+        at first-token time instead of waiting for the full completion.
+        generate_response remains for consumers that need the whole string.
+        """
+        try:
+            user_prompt = f"Context: {context}\n\nUser message: {message}"
+            stream = await self._create_with_backoff(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": _SYS_PROMPT_RESPONSE},
+                    {"role": "user", "content": user_prompt}
+                ],
+                max_tokens=500,
+                temperature=0.1,
+                stream=True
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            yield await self.generate_dynamic_fallback("technical_error", {"error": str(e)})
+
     async def generate_friendly_job_list(
         self,
         jobs: list[dict],
@@ -368,30 +1233,29 @@ class OpenAIService:
         jobs: list of dicts with keys: job_title, company_name, status, job_link (optional)
         """
         try:
-            system_prompt = """
-            You are JobTrackAI, a warm and emotionally intelligent assistant. Create a personalized summary of job applications.
-            
-            Requirements:
-            - Do NOT invent or alter facts. Use only provided fields.
-            - Do NOT include internal IDs.
-            - Show each item as: "<index>. <job_title> — <company_name> [<status>]" and on the next indented line include "Link: <job_link>" if present.
-            - Be supportive and encouraging, but adapt tone to user's request and context
-            - If user asked for specific company/role, acknowledge their focused search
-            - End with a brief encouraging line that feels natural to the conversation
-            - Keep it conversational, not robotic
-            """
+            system_prompt = _SYS_PROMPT_JOB_LIST
 
             content = {
                 "header": header,
                 "jobs": jobs,
                 "footer_tip": footer_tip,
                 "user_message": user_message,
-                "conversation_context": conversation_context,
+                "conversation_context": _trim_context(conversation_context),
             }
             user_prompt = (
                 "Create a personalized job list response based on the user's request and context.\n" +
-                json.dumps(content, ensure_ascii=False)
+                _dump_payload(content)
             )
+            # Bound the payload: drop oldest jobs until the prompt fits the
+            # budget, so latency stays O(budget) rather than O(|jobs|).
+            # Callers pass rows ordered date_added DESC, so the newest jobs
+            # are at the head — keep that half.
+            while len(user_prompt) > _MAX_PROMPT_CHARS and len(content["jobs"]) > 1:
+                content["jobs"] = content["jobs"][:len(content["jobs"]) // 2]
+                user_prompt = (
+                    "Create a personalized job list response based on the user's request and context.\n" +
+                    _dump_payload(content)
+                )
 
             response = await self._get_chat_completion(
                 system_prompt=system_prompt,
@@ -418,25 +1282,11 @@ class OpenAIService:
         user_message: Optional[str] = None,
     ) -> str:
         """Friendly confirmation message after creating a job."""
+        template = _CREATED_TEMPLATES.get((status or "").lower())
+        if template:
+            return template.format(title=job_title, company=company_name)
         try:
-            system_prompt = """
-            You are JobTrackAI, a warm, emotionally intelligent assistant who genuinely celebrates job application milestones.
-            
-            Create a personalized confirmation for this newly added job application.
-            
-            Guidelines:
-            - Be genuinely excited and encouraging (but not over the top)
-            - Make it feel personal to their specific situation
-            - Use natural, conversational language (avoid robotic templates)
-            - Include 1 emoji max, and only if it feels natural
-            - If they seem excited, match their energy
-            - If they're just matter-of-fact, be supportive but not overly cheerful
-            - Reference specific details about the role/company when relevant
-            - Keep it concise but meaningful
-            - NO internal IDs or technical details
-            
-            Remember: This is a real person working toward their career goals. Make them feel heard and supported.
-            """
+            system_prompt = _SYS_PROMPT_JOB_CREATED
             
             payload = {
                 "job_title": job_title,
@@ -444,18 +1294,18 @@ class OpenAIService:
                 "status": status,
                 "job_link": job_link,
                 "user_message": user_message,
-                "conversation_context": conversation_context,
+                "conversation_context": _trim_context(conversation_context),
             }
             
             user_msg = f"""
             Generate a personalized job creation confirmation:
             
-            Job Details: {json.dumps(payload)}
+            Job Details: {_dump_payload(payload)}
             
             Make this feel like a real conversation, not a template. Consider the user's tone and context.
             """
             
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, max_tokens=120)
             if response:
                 return response
         except Exception as e:
@@ -475,43 +1325,28 @@ class OpenAIService:
         user_message: str = "",
         conversation_context: str = "",
     ) -> str:
-        """Friendly confirmation after updating status; tone guided by status via OpenAI."""
+        """Friendly confirmation after updating status; tone guided by status via a local template, falling back to OpenAI for unexpected statuses."""
+        template = _STATUS_UPDATED_TEMPLATES.get((status or "").lower())
+        if template:
+            return template.format(title=job_title, company=company_name)
         try:
-            system_prompt = """
-            You are JobTrackAI, a warm and emotionally intelligent assistant.
-            Create a personalized status update confirmation that feels natural and supportive.
-            
-            Tone guidelines based on status:
-            - rejected: Compassionate, validating, gently encouraging - acknowledge the disappointment but remind them of their worth
-            - withdrawn: Affirming - celebrate their decision-making and self-awareness
-            - interview: Excited and supportive - offer encouragement and confidence building
-            - offer: Celebratory - this is huge news, be genuinely excited for them
-            - applied: Supportive momentum - acknowledge their proactive effort
-            
-            Key principles:
-            - Match the user's tone and energy from their message
-            - Be genuine and conversational, not robotic
-            - Keep it concise but meaningful (1-2 sentences)
-            - Use 1 emoji max, and only if it feels natural
-            - Reference specific details when relevant
-            - No internal IDs or technical details
-            """
+            system_prompt = _SYS_PROMPT_STATUS_UPDATED
             
             payload = {
                 "job_title": job_title,
                 "company_name": company_name,
                 "status": status,
                 "user_message": user_message,
-                "conversation_context": conversation_context,
+                "conversation_context": _trim_context(conversation_context),
             }
             user_msg = f"""
             Create a personalized status update confirmation:
             
-            Status Update: {json.dumps(payload)}
+            Status Update: {_dump_payload(payload)}
             
             Make this feel like a supportive friend responding, not a system notification.
             """
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, max_tokens=100)
             if response:
                 return response
         except Exception as e:
@@ -525,19 +1360,10 @@ class OpenAIService:
     async def generate_friendly_fallback(self, intent: IntentType) -> str:
         """LLM-generated fallback message tailored to the inferred intent."""
         try:
-            system_prompt = """
-            You are JobTrackAI, a friendly assistant. The system needs a fallback reply.
-            Produce a concise, supportive, human message (1 emoji max) tailored to the intent provided.
-            - For JOB_SEARCH: invite the user to view or filter their applications.
-            - For STATUS_UPDATE: ask for the missing piece (job or status) as a single, clear question.
-            - For NEW_JOB: ask for the missing required fields (job_title and/or company_name) succinctly.
-            - For JOB_DELETE: ask what they want to delete (by status, company, etc.).
-            - For AMBIGUOUS/UNKNOWN: suggest a couple of helpful next actions.
-            Do not expose internal IDs.
-            """
+            system_prompt = _SYS_PROMPT_FALLBACK
             payload = {"intent": intent.value}
-            user_msg = "Generate a single friendly fallback for this intent:\n" + json.dumps(payload)
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            user_msg = "Generate a single friendly fallback for this intent:\n" + _dump_payload(payload)
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, priority="flex", max_tokens=80)
             if response:
                 return response
         except Exception as e:
@@ -548,15 +1374,10 @@ class OpenAIService:
     async def generate_friendly_refusal(self, reason: str) -> str:
         """Kind yet firm refusal message for sensitive or malicious requests (via OpenAI)."""
         try:
-            system_prompt = """
-            You are JobTrackAI, a gen-z assistant. The user asked for something sensitive or unsafe.
-            Respond with something witty and funny e.g: "Get your money up, not your funny up".
-            Do NOT expose internal IDs, environment variables, secrets, or any confidential data.
-            Try to keep it to 2-3 sentences.
-            """
+            system_prompt = _SYS_PROMPT_REFUSAL
             payload = {"reason": reason}
-            user_msg = "Refuse this unsafe request and suggest safe next steps:\n" + json.dumps(payload)
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            user_msg = "Refuse this unsafe request and suggest safe next steps:\n" + _dump_payload(payload)
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, priority="flex", max_tokens=120)
             if response:
                 return response
         except Exception as e:
@@ -573,22 +1394,23 @@ class OpenAIService:
         known_fields keys can include: job_title, company_name, status, job_link, job_description
         missing_fields: list of field names to request (e.g., ["job_title"]).
         """
+        if len(missing_fields) == 1:
+            templates = _MISSING_FIELD_TEMPLATES.get(missing_fields[0])
+            if templates:
+                company = known_fields.get("company_name")
+                title = known_fields.get("job_title")
+                return random.choice(templates).format(
+                    company_part=f" — {company}" if company else "",
+                    title_part=f" — {title}" if title else "",
+                )
         try:
-            system_prompt = """
-            You are JobTrackAI, a friendly assistant. Ask for the missing required field(s) in a warm, concise way.
-            Rules:
-            - Restate any known fields succinctly.
-            - Ask ONLY for the specific missing fields by name.
-            - Keep tone supportive, 1 emoji max, no fluff.
-            - Do not expose internal IDs.
-            - Use short lines, no long paragraphs.
-            """
+            system_prompt = _SYS_PROMPT_MISSING_FIELDS
             payload = {
                 "known": known_fields,
                 "missing": missing_fields,
             }
-            user_message = "Craft a single friendly prompt asking for the exact missing fields, given this context:\n" + json.dumps(payload)
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_message)
+            user_message = "Craft a single friendly prompt asking for the exact missing fields, given this context:\n" + _dump_payload(payload)
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_message, priority="flex", max_tokens=120)
             if response:
                 return response
         except Exception as e:
@@ -609,62 +1431,188 @@ class OpenAIService:
             "missing_fields": missing_fields
         })
     
+    async def _create_with_backoff(self, **params) -> ChatCompletion:
+        """Create a chat completion under the concurrency bound, retrying
+        transient failures (rate limits, timeouts, dropped connections)
+        with jittered exponential backoff. Without the retry those errors
+        surface as permanent UNKNOWN/fallback answers in the classifiers."""
+        stats = self._api_stats.setdefault(params.get("model", self.model), {
+            "calls": 0, "errors": 0, "seconds": 0.0,
+            "prompt_tokens": 0, "completion_tokens": 0,
+        })
+        for attempt in range(3):
+            started = time.perf_counter()
+            try:
+                async with self._api_semaphore:
+                    response = await self.client.chat.completions.create(**params)
+                stats["calls"] += 1
+                stats["seconds"] += time.perf_counter() - started
+                # Streaming responses report usage per-chunk, not here
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    stats["prompt_tokens"] += usage.prompt_tokens
+                    stats["completion_tokens"] += usage.completion_tokens
+                return response
+            except (RateLimitError, APITimeoutError, APIConnectionError) as e:
+                stats["errors"] += 1
+                if attempt == 2:
+                    self._unhealthy_until = time.monotonic() + 60.0
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning("OpenAI %s; retrying in %.1fs", type(e).__name__, delay)
+                await asyncio.sleep(delay)
+
+    async def _get_label_completion(
+        self,
+        system_prompt: str,
+        user_message: str
+    ) -> Tuple[Optional[str], float]:
+        """Single-label completion whose confidence comes from token logprobs.
+
+        Asking the model to print its own confidence spends output tokens on
+        a number it largely invents; exp(logprob of the first generated
+        token) is calibrated and free. Results are cached like the other
+        classifier completions.
+        """
+        cache_key = self._cache_key(system_prompt, user_message, model=self.classify_model)
+        async with self._completion_cache_lock:
+            if cache_key in self._completion_cache:
+                self._completion_cache.move_to_end(cache_key)
+                self._cache_hits += 1
+                return self._completion_cache[cache_key]
+            self._cache_misses += 1
+        try:
+            response = await self._create_with_backoff(
+                model=self.classify_model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                max_tokens=6,
+                temperature=0.0,
+                logprobs=True,
+                top_logprobs=5
+            )
+            choice = response.choices[0]
+            label = choice.message.content
+            confidence = 0.8  # Default when logprobs are unavailable
+            try:
+                confidence = min(1.0, math.exp(choice.logprobs.content[0].logprob))
+            except (AttributeError, IndexError, TypeError):
+                pass
+            async with self._completion_cache_lock:
+                self._completion_cache[cache_key] = (label, confidence)
+                self._completion_cache.move_to_end(cache_key)
+                while len(self._completion_cache) > _COMPLETION_CACHE_SIZE:
+                    self._completion_cache.popitem(last=False)
+            return label, confidence
+        except Exception as e:
+            logger.error(f"OpenAI API error: {str(e)}")
+            return None, 0.0
+
     async def _get_chat_completion(
-        self, 
-        system_prompt: str, 
+        self,
+        system_prompt: str,
         user_message: str,
-        response_format: Optional[Dict[str, str]] = None
+        response_format: Optional[Dict[str, str]] = None,
+        cache: bool = False,
+        priority: str = "interactive",
+        max_tokens: int = 500,
+        stop: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.1
     ) -> Optional[str]:
         """
         Get chat completion from OpenAI API
-        
+
         Args:
             system_prompt: The system prompt to guide the model
             user_message: The user message to respond to
             response_format: Optional format specification, e.g. {"type": "json_object"}
+            cache: Serve repeats of the same (system, user) pair from the
+                exact-match LRU cache instead of re-calling the API. Only
+                safe for deterministic classifier/extraction prompts.
+            priority: "interactive" (default) uses the main model; "flex"
+                routes cosmetic responses to OPENAI_FLEX_MODEL and, when
+                configured, OpenAI's discounted flex service tier.
+            max_tokens: Output budget; decode latency scales with it, so
+                single-line classifier calls should pass a small value.
+            stop: Optional stop sequences, e.g. ["\n"] for one-line replies.
+            model: Override the routed model (e.g. self.classify_model for
+                label-only calls); defaults to the priority-based choice.
+            temperature: 0.1 by default; classifier/structured call sites
+                pass 0.0 so repeated inputs produce byte-identical outputs
+                and the caches stay maximally effective.
         """
+        if model is None:
+            model = self.flex_model if priority == "flex" else self.model
+        cache_key = None
+        pending = None
+        if cache:
+            cache_key = self._cache_key(system_prompt, user_message, model=model, temperature=temperature)
+            async with self._completion_cache_lock:
+                if cache_key in self._completion_cache:
+                    self._completion_cache.move_to_end(cache_key)
+                    self._cache_hits += 1
+                    return self._completion_cache[cache_key]
+                self._cache_misses += 1
+                pending = self._inflight.get(cache_key)
+                if pending is None:
+                    self._inflight[cache_key] = asyncio.get_running_loop().create_future()
+            if pending is not None:
+                # Identical request already in flight; piggyback on its result
+                return await pending
+        content = None
         try:
             params = {
-                "model": self.model,
+                "model": model,
                 "messages": [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message}
                 ],
-                "max_tokens": 500,
-                "temperature": 0.1
+                "max_tokens": max_tokens,
+                "temperature": temperature
             }
+            if stop:
+                params["stop"] = stop
+            if priority == "flex" and self.flex_service_tier:
+                params["service_tier"] = self.flex_service_tier
             
             # Add response_format if specified
             if response_format:
                 params["response_format"] = response_format
                 
-            response: ChatCompletion = self.client.chat.completions.create(**params)
-            
-            return response.choices[0].message.content
-            
+            response: ChatCompletion = await self._create_with_backoff(**params)
+
+            content = response.choices[0].message.content
+            if cache_key is not None:
+                async with self._completion_cache_lock:
+                    self._completion_cache[cache_key] = content
+                    self._completion_cache.move_to_end(cache_key)
+                    while len(self._completion_cache) > _COMPLETION_CACHE_SIZE:
+                        self._completion_cache.popitem(last=False)
+            return content
+
         except Exception as e:
             logger.error(f"OpenAI API error: {str(e)}")
             return None
+        finally:
+            if cache_key is not None:
+                waiter = self._inflight.pop(cache_key, None)
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(content)
 
     async def generate_friendly_error(self, error_type: str, context: Dict[str, Any] = None) -> str:
         """Generate a friendly, witty error message with personality."""
         try:
-            system_prompt = """
-            You are JobTrackAI, a friendly assistant with a touch of humor. The user encountered an error.
-            Generate a friendly, supportive error message with these rules:
-            - Keep it concise (1-2 sentences)
-            - Add a touch of personality and wit (1 emoji max)
-            - Be encouraging and suggest a simple next step
-            - Do NOT expose technical details or internal IDs
-            - Match tone to error severity (light for minor issues, more serious for data problems)
-            """
+            system_prompt = _SYS_PROMPT_ERROR
             
             payload = {
                 "error_type": error_type,
                 "context": context or {}
             }
-            user_msg = "Create a friendly error message for this situation:\n" + json.dumps(payload)
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            user_msg = "Create a friendly error message for this situation:\n" + _dump_payload(payload)
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, max_tokens=120)
             if response:
                 return response
         except Exception as e:
@@ -687,43 +1635,50 @@ class OpenAIService:
                 - missing_fields: List of field names still missing
                 - confidence: Float indicating confidence in the completeness check
         """
+        # Deterministic fast path: whether the two required fields are
+        # present is a plain dict check, so only genuinely ambiguous cases
+        # (a field missing with conversation context that might fill it)
+        # should pay for a completion.
+        missing = [f for f in ("job_title", "company_name") if not extraction.get(f)]
+        if not missing:
+            return {
+                "complete_fields": extraction,
+                "missing_fields": [],
+                "confidence": 1.0,
+            }
+        if not conversation_history:
+            return {
+                "complete_fields": extraction,
+                "missing_fields": missing,
+                "confidence": 1.0,
+            }
         try:
-            system_prompt = """
-            You are JobTrackAI, a job application tracking assistant. Your task is to analyze a conversation 
-            and determine if all required job details are present for creating a job entry.
-            
-            Required fields are:
-            - job_title: The title of the job position
-            - company_name: The name of the company offering the job
-            
-            Optional fields are:
-            - job_link: URL to the job posting
-            - job_description: Brief description of the job
-            - status: Current application status (default is APPLIED if a job link is present)
-            
-            Analyze the conversation history and the current extraction to:
-            1. Determine if the required fields are complete or can be inferred from context
-            2. For any missing required fields, check if they can be found in the conversation history
-            3. Return a JSON with complete fields, missing fields, and confidence score
-            
-            Rules:
-            - If a short reply (1-3 words) follows a request for a specific field, treat it as that field
-            - Company names are often short (e.g., "Google", "Microsoft", "Apple")
-            - Job titles can vary in length but are typically descriptive
-            - If a job link is present but other fields are missing, try to infer them from context
-            - Be confident (0.9+) only when fields are explicitly mentioned or clearly inferable
-            """
-            
-            # Prepare the payload with extraction and conversation history
+            system_prompt = _SYS_PROMPT_COMPLETENESS
+            
+            # Budget recent history by size, newest first: a count slice
+            # can still admit one enormous assistant reply, while the char
+            # budget (~400 tokens at ~4 chars each) keeps the prompt flat
+            history = []
+            remaining = 1600
+            for msg in reversed(conversation_history):
+                cost = len(msg.get("content", ""))
+                if history and cost > remaining:
+                    break
+                history.append(msg)
+                remaining -= cost
+                if remaining <= 0:
+                    break
+            history.reverse()
+
             payload = {
                 "extraction": extraction,
-                "conversation_history": conversation_history[-5:],  # Last 5 messages for context
+                "conversation_history": history,
                 "job_link": job_link
             }
             
-            user_message = "Analyze this conversation and extraction to determine if all required job details are present:\n" + json.dumps(payload)
+            user_message = "Analyze this conversation and extraction to determine if all required job details are present:\n" + _dump_payload(payload)
             
-            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_message, response_format={"type": "json_object"})
+            response = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_message, response_format={"type": "json_object"}, max_tokens=300, temperature=0.0)
             
             if not response:
                 return {
@@ -754,19 +1709,9 @@ class OpenAIService:
     async def generate_interview_prep_response(self, job_info: dict) -> str:
         """Generate interview preparation advice based on job details."""
         try:
-            system_prompt = """
-            You are JobTrackAI, a supportive career coach. Generate practical interview prep advice.
-            
-            Provide 3-4 actionable tips specific to the role/company if available, or general interview advice.
-            Keep it encouraging and practical. Include:
-            - Research suggestions
-            - Common questions to prep
-            - One confidence-building tip
-            
-            Format as short bullet points, max 4 lines total.
-            """
+            system_prompt = _SYS_PROMPT_INTERVIEW_PREP
             user_msg = f"Help user prep for interview at {job_info.get('company_name', 'this company')} for {job_info.get('job_title', 'this role')}"
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, max_tokens=200)
             if res:
                 return res
         except Exception as e:
@@ -777,22 +1722,17 @@ class OpenAIService:
     async def generate_smart_job_clarification(self, message: str, matches: list, context: str = "") -> str:
         """Generate intelligent clarification that tries to understand user intent first."""
         try:
-            system_prompt = """
-            You are JobTrackAI, an intelligent assistant. The user mentioned a job update but there are multiple matches.
-            
-            Analyze their message to see if you can determine which job they mean without asking:
-            - Look for company names, job titles, or other identifying details
-            - Consider recent context if provided
-            - If truly ambiguous, ask in a friendly way with a short numbered list
-            
-            Be smart about context - don't ask if it's obvious which one they mean.
-            Always be personalized and natural - no robotic responses.
-            """
-            
-            matches_summary = [f"{i+1}. {j['job_title']} at {j['company_name']}" for i, j in enumerate(matches)]
+            system_prompt = _SYS_PROMPT_CLARIFICATION
+            
+            # A clarification question only needs a handful of candidates;
+            # cap the list so prompt and reply stay O(1) in the match count
+            shown = matches[:8]
+            matches_summary = [f"{i+1}. {j['job_title']} at {j['company_name']}" for i, j in enumerate(shown)]
+            if len(matches) > len(shown):
+                matches_summary.append(f"...and {len(matches) - len(shown)} more")
             user_msg = f"Message: {message}\nMatches: {matches_summary}\nContext: {context}"
             
-            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg)
+            res = await self._get_chat_completion(system_prompt=system_prompt, user_message=user_msg, max_tokens=200)
             if res:
                 return res
         except Exception as e:
@@ -808,185 +1748,14 @@ class OpenAIService:
     async def generate_dynamic_response(self, response_type: str, context: dict, user_message: str = "", conversation_context: str = "") -> str:
         """Universal dynamic response generator for any scenario - NO MORE HARDCODED STRINGS!"""
         try:
-            # Base personality for all responses
-            base_personality = """
-            You are JobTrackAI, a warm, emotionally intelligent, and witty assistant who helps with job applications.
-            
-            Core personality traits:
-            - Genuinely supportive and encouraging
-            - Naturally conversational (not robotic)
-            - Adapts tone to user's emotional state
-            - Uses gentle humor when appropriate
-            - Never exposes internal system details
-            - Personalizes responses based on context
-            - Keeps responses concise but meaningful
-            """
-            
-            # Response type specific prompts
-            prompts = {
-                "status_missing": f"""
-                {base_personality}
-                
-                The user wants to update a job status but didn't specify which status.
-                Context: {context}
-                
-                Ask them for the new status in a friendly, natural way. The options are:
-                applied, interview, offer, rejected, withdrawn
-                
-                Make it feel like a conversation, not a form.
-                """,
-                
-                "no_jobs_found": f"""
-                {base_personality}
-                
-                The user has no job applications yet.
-                Context: {context}
-                
-                Encourage them to add their first job application in a supportive way.
-                Make them feel like they're starting an exciting journey.
-                """,
-                
-                "job_creation_failed": f"""
-                {base_personality}
-                
-                We couldn't create a job entry for technical reasons.
-                Context: {context}
-                
-                Acknowledge the issue gracefully and suggest trying again.
-                Be reassuring - it's not their fault.
-                """,
-                
-                "job_not_found": f"""
-                {base_personality}
-                
-                The user tried to update a job that doesn't exist in their list.
-                Context: {context}
-                
-                Gently let them know we couldn't find that job, and offer to help them add it or find the right one.
-                """,
-                
-                "job_not_found_with_clarification": f"""
-                {base_personality}
-                
-                The user tried to update a job that doesn't exist in their list.
-                Context: {context}
-                
-                Be helpful and transparent:
-                1. Explain what we searched for specifically
-                2. Show them what jobs they DO have (if any)
-                3. Ask clear questions: "Did you mean one of these jobs?" or "Should I add this as a new job?"
-                4. Be empathetic to their situation
-                """,
-                
-                "bulk_confirmation": f"""
-                {base_personality}
-                
-                The user wants to update all their jobs to the same status.
-                Context: {context}
-                
-                Ask for confirmation in a way that shows the impact.
-                Make sure they really want to do this.
-                """,
-                
-                "generic_error": f"""
-                {base_personality}
-                
-                Something went wrong but we don't want to expose technical details.
-                Context: {context}
-                
-                Acknowledge the hiccup gracefully and suggest next steps.
-                Stay positive and helpful.
-                """,
-                
-                "status_updated_with_confirmation": f"""
-                {base_personality}
-                
-                A job status was automatically updated in the database.
-                Context: {context}
-                
-                IMPORTANT: You must clearly tell the user what was changed:
-                - Which specific job was updated
-                - What the status changed from and to
-                - Acknowledge their emotional state appropriately
-                
-                Be transparent about the action taken while remaining supportive.
-                """,
-                
-                "no_jobs_to_delete": f"""
-                {base_personality}
-                
-                The user wants to delete jobs but no jobs match their criteria.
-                Context: {context}
-                
-                Gently let them know there are no jobs to delete matching their specified criteria.
-                Be specific about what they're looking for (status, company, etc.)
-                Offer to show what jobs they do have or help with other actions.
-                """,
-                
-                "delete_confirmation": f"""
-                {base_personality}
-                
-                The user wants to delete multiple jobs and we need confirmation.
-                Context: {context}
-                
-                IMPORTANT: Show them exactly what will be deleted and ask for clear confirmation.
-                - List the specific jobs that will be deleted
-                - Make it clear this action cannot be undone
-                - Ask for explicit "yes" or "no" confirmation
-                Be supportive but make sure they understand the consequences.
-                """,
-                
-                "delete_clarification_needed": f"""
-                {base_personality}
-                
-                The user wants to delete jobs but wasn't specific about which ones.
-                Context: {context}
-                
-                Help them clarify:
-                - Ask what criteria they want to use (status, company, etc.)
-                - Give examples like "rejected jobs" or "applications at Google"
-                - Be helpful and supportive
-                """,
-                
-                "deletion_completed": f"""
-                {base_personality}
-                
-                Jobs have been successfully deleted from the database.
-                Context: {context}
-                
-                Confirm what was deleted and be supportive:
-                - Tell them exactly how many jobs were deleted
-                - Acknowledge this helps clean up their application list
-                - Offer next steps like viewing remaining jobs
-                """,
-                
-                "deletion_failed": f"""
-                {base_personality}
-                
-                Job deletion failed for some reason.
-                Context: {context}
-                
-                Acknowledge the issue and offer alternatives:
-                - Explain that the deletion couldn't be completed
-                - Suggest trying again or checking what jobs they have
-                - Be helpful and reassuring
-                """
-            }
-            
-            system_prompt = prompts.get(response_type, f"""
-            {base_personality}
-            
-            Generate a response for: {response_type}
-            Context: {context}
-            
-            Be natural, helpful, and personalized to the situation.
-            """)
+            template = _DYNAMIC_PROMPT_TEMPLATES.get(response_type, _DYNAMIC_PROMPT_DEFAULT)
+            system_prompt = template.format(base=_BASE_PERSONALITY, type=response_type, context=context)
             
             user_prompt = f"""
             User message: {user_message}
             Conversation context: {conversation_context}
             Situation: {response_type}
-            Details: {json.dumps(context)}
+            Details: {_dump_payload(context)}
             
             Generate a personalized, natural response for this specific situation.
             """
@@ -1002,70 +1771,69 @@ class OpenAIService:
         return await self.generate_dynamic_fallback(response_type, context)
 
     async def generate_dynamic_fallback(self, situation: str, context: dict) -> str:
-        """Emergency fallback generator when primary response generation fails."""
+        """Emergency fallback when primary response generation fails.
+
+        The static reply is the answer of record; the LLM only gets a
+        short, bounded attempt to improve on it, and is skipped entirely
+        for a minute after the provider last exhausted its retries.
+        """
+        static = random.choice(_FALLBACK_TABLE.get(situation, _FALLBACK_DEFAULT))
+        if time.monotonic() < self._unhealthy_until:
+            return static
         try:
-            system_prompt = f"""
-            You are JobTrackAI. Generate a brief, helpful response for this situation: {situation}
-            Context: {context}
-            
-            Keep it simple, warm, and actionable. No robotic language.
-            """
-            
-            response = await self._get_chat_completion(
-                system_prompt=system_prompt,
-                user_message=f"Generate emergency response for: {situation}"
+            system_prompt = (
+                f"{_BASE_PERSONALITY}\n"
+                f"Generate a brief, helpful response for this situation: {situation}\n"
+                f"Context: {context}"
+            )
+            response = await asyncio.wait_for(
+                self._get_chat_completion(
+                    system_prompt=system_prompt,
+                    user_message=f"Generate emergency response for: {situation}",
+                    max_tokens=80
+                ),
+                timeout=2.0,
             )
             if response:
                 return response
         except Exception:
             pass
-        
-        # Absolute last resort
-        return "Something went wrong, but I'm here to help! What would you like to do with your job applications? ✨"
+        return static
 
     def _normalize_status(self, status_str: Optional[str], *, original_message: Optional[str] = None) -> Optional[JobStatus]:
         """Map arbitrary status strings (and message hints) to allowed JobStatus values."""
         try:
             text = (status_str or "").strip().lower()
             msg = (original_message or "").lower()
+            value = _normalize_status_cached(text, msg)
+            return _STATUS_VALUES.get(value) if value else None
+        except Exception:
+            return None
 
-            # Strong hints from message
-            if any(k in msg for k in [" i applied", "i've applied", "applied to", "application submitted", "submit my application", "submitted my application"]):
-                return JobStatus.APPLIED
-
-            mapping = {
-                "applied": JobStatus.APPLIED,
-                "apply": JobStatus.APPLIED,
-                "application": JobStatus.APPLIED,
-                "interview": JobStatus.INTERVIEW,
-                "interviewing": JobStatus.INTERVIEW,
-                "phone screen": JobStatus.INTERVIEW,
-                "screen": JobStatus.INTERVIEW,
-                "onsite": JobStatus.INTERVIEW,
-                "offer": JobStatus.OFFER,
-                "offered": JobStatus.OFFER,
-                "rejected": JobStatus.REJECTED,
-                "reject": JobStatus.REJECTED,
-                "declined by them": JobStatus.REJECTED,
-                "decline": JobStatus.REJECTED,
-                "withdrawn": JobStatus.WITHDRAWN,
-                "withdraw": JobStatus.WITHDRAWN,
-                "withdrew": JobStatus.WITHDRAWN,
-            }
+@lru_cache(maxsize=4096)
+def _normalize_status_cached(text: str, msg: str) -> Optional[str]:
+    """Pure, memoized core of _normalize_status over lowercased inputs.
 
-            # Exact match first
-            if text in mapping:
-                return mapping[text]
+    Users repeat the same status phrasings constantly, so the keyword scan
+    collapses to a dict lookup for repeat inputs. Returns the JobStatus
+    value string (enum members would work as cache values too, but the
+    plain string keeps entries trivially comparable and picklable).
+    """
+    # Strong hints from message
+    if _APPLIED_HINT_RE.search(msg):
+        return JobStatus.APPLIED.value
 
-            # Contains matching
-            for key, value in mapping.items():
-                if key in text:
-                    return value
+    # Exact match first
+    if text in _STATUS_MAPPING:
+        return _STATUS_MAPPING[text].value
 
-            # Infer applied when a link is present and no contrary status is given
-            if original_message and ("http://" in msg or "https://" in msg):
-                return JobStatus.APPLIED
+    # Single-pass keyword scan (longest match wins)
+    match = _STATUS_KEYWORD_RE.search(text)
+    if match:
+        return _STATUS_MAPPING[match.group(0)].value
 
-            return None
-        except Exception:
-            return None
+    # Infer applied when a link is present and no contrary status is given
+    if msg and _URL_RE.search(msg):
+        return JobStatus.APPLIED.value
+
+    return None
@@ -0,0 +1,71 @@
+"""
+Semantic cache for JobTrackAI
+Embedding-similarity lookup used to skip redundant LLM calls for paraphrases
+"""
+
+import operator
+from array import array
+from collections import deque
+from itertools import chain
+from typing import Any, List, Optional, Tuple
+
+# Above this cosine similarity a cached entry is considered a match; near
+# this score the scan can stop early because the label cannot usefully change
+_DEFAULT_THRESHOLD = 0.92
+_EARLY_EXIT_SCORE = 0.98
+
+def quantize_embedding(vector: array) -> Tuple[array, float]:
+    """Quantize a normalized float vector to int8 plus a scale factor that
+    recovers approximate float dot products."""
+    peak = max(abs(x) for x in vector) or 1.0
+    quantized = array("b", (round(x / peak * 127) for x in vector))
+    return quantized, peak / 127.0
+
+class SemanticCache:
+    """Bounded FIFO of embedded texts mapped to cached values.
+
+    Entries are stored int8-quantized with a per-vector scale (4x less
+    memory scanned per lookup than float32, negligible cosine accuracy
+    loss). Seeds are permanent labeled examples; stored entries rotate out
+    oldest-first. Lookup is a deliberate linear scan: the cache is bounded
+    at a few hundred entries, well below the point where an approximate-NN
+    index amortizes its overhead.
+    """
+
+    def __init__(self, maxlen: int = 256, threshold: float = _DEFAULT_THRESHOLD):
+        self._threshold = threshold
+        # (int8 embedding, scale, value) tuples
+        self._seeds: List[Tuple[array, float, Any]] = []
+        self._entries: "deque[Tuple[array, float, Any]]" = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._seeds) + len(self._entries)
+
+    def add_seed(self, vector: array, value: Any) -> None:
+        """Add a permanent labeled entry (never evicted)."""
+        quantized, scale = quantize_embedding(vector)
+        self._seeds.append((quantized, scale, value))
+
+    def store(self, vector: array, value: Any) -> None:
+        """Add a rotating entry, evicting the oldest when full."""
+        quantized, scale = quantize_embedding(vector)
+        self._entries.append((quantized, scale, value))
+
+    def lookup(self, query: array) -> Optional[Any]:
+        """Return the value whose embedding is most similar to the query,
+        or None when nothing clears the threshold."""
+        best_score = 0.0
+        best_value = None
+        mul = operator.mul
+        for embedding, scale, value in chain(self._seeds, self._entries):
+            # sum(map(mul, ...)) keeps the 1536-wide dot product in C, with
+            # no per-element bytecode — the closest stdlib gets to a BLAS dot
+            score = sum(map(mul, embedding, query)) * scale
+            if score >= _EARLY_EXIT_SCORE:
+                return value
+            if score > best_score:
+                best_score = score
+                best_value = value
+        if best_value is not None and best_score >= self._threshold:
+            return best_value
+        return None
@@ -3,17 +3,156 @@ Supabase service for JobTrackAI
 Handles database operations and connection management
 """
 
+import asyncio
 import os
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timezone
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import AsyncIterator, List, Optional, Dict, Any
 from supabase import create_client, Client
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from app.models.job import JobCreate, JobUpdate, JobStatus
 
 logger = logging.getLogger(__name__)
 
+# Hot-path SQL hoisted to module constants: the statement text stays
+# byte-identical across calls, which keeps pg_stat_statements aggregation
+# clean and lets server-side plan caching (PREPARE, or a driver cache if
+# one is ever adopted) key on a stable string.
+# Job column sets: list views skip job_description, which can be many KB
+# per row and is never read from listing results; single-row fetches and
+# write RETURNING clauses keep the full set.
+_JOB_LIST_COLS = "id, user_id, job_title, company_name, job_link, status, date_added, last_updated"
+
+_SQL_GET_USER_BY_PHONE = """
+    SELECT id, phone_e164, display_name, metadata, created_at, updated_at
+    FROM users
+    WHERE phone_e164 = %s
+    LIMIT 1
+"""
+_SQL_UPSERT_USER = """
+    INSERT INTO users (phone_e164, display_name, metadata)
+    VALUES (%s, %s, %s::jsonb)
+    ON CONFLICT (phone_e164) DO UPDATE SET
+        display_name = COALESCE(users.display_name, EXCLUDED.display_name),
+        updated_at = NOW()
+    RETURNING id, phone_e164, display_name, metadata, created_at, updated_at
+"""
+_SQL_ADD_MESSAGE = """
+    WITH ins AS (
+        INSERT INTO messages (conversation_id, user_id, role, content, tool_calls)
+        VALUES (%s::uuid, %s::uuid, %s, %s, %s::jsonb)
+        RETURNING id, conversation_id, user_id, role, content, tool_calls, created_at
+    ), touch AS (
+        UPDATE conversations
+        SET last_message_at = NOW(), updated_at = NOW()
+        WHERE id = %s::uuid
+    )
+    SELECT * FROM ins
+"""
+# search_jobs SQL memoized per filter shape: each distinct combination of
+# optional predicates yields one stable statement string, built on first use
+# and reused after, so repeated searches with the same shape hit the same
+# server-side plan cache entry.
+_SEARCH_JOBS_SQL: Dict[tuple, str] = {}
+
+def _search_jobs_sql(has_company: bool, has_title: bool, has_status: bool,
+                     has_cursor: bool, aggregate: bool = False) -> str:
+    key = (has_company, has_title, has_status, has_cursor, aggregate)
+    sql = _SEARCH_JOBS_SQL.get(key)
+    if sql is None:
+        where = ["user_id = %s::uuid"]
+        if has_company:
+            where.append("company_name ILIKE %s")
+        if has_title:
+            where.append("job_title ILIKE %s")
+        if has_status:
+            where.append("status = %s")
+        if has_cursor:
+            where.append("(date_added, id) < (%s, %s::uuid)")
+        # LIMIT is always bound — NULL means unbounded — so limited and
+        # unlimited calls share one statement shape
+        sql = (
+            f"SELECT {_JOB_LIST_COLS} FROM jobs WHERE "
+            + " AND ".join(where)
+            + " ORDER BY date_added DESC, id DESC LIMIT COALESCE(%s, 2147483647)"
+        )
+        if aggregate:
+            # One JSON array built in C by Postgres instead of N DictRow
+            # conversions in Python; psycopg2 parses the json column once
+            sql = f"SELECT COALESCE(json_agg(j), '[]'::json) FROM ({sql}) j"
+        _SEARCH_JOBS_SQL[key] = sql
+    return sql
+
+_SQL_GET_OR_CREATE_CONVERSATION = """
+    WITH existing AS (
+        SELECT id, user_id, title, metadata, created_at, updated_at, last_message_at
+        FROM conversations
+        WHERE user_id = %(user_id)s::uuid
+        ORDER BY last_message_at DESC NULLS LAST, updated_at DESC
+        LIMIT 1
+    ), ins AS (
+        INSERT INTO conversations (user_id)
+        SELECT %(user_id)s::uuid
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        RETURNING id, user_id, title, metadata, created_at, updated_at, last_message_at
+    )
+    SELECT * FROM existing
+    UNION ALL
+    SELECT * FROM ins
+"""
+_SQL_CHAT_CONTEXT = """
+    WITH u AS (
+        INSERT INTO users (phone_e164, display_name, metadata)
+        VALUES (%(phone_e164)s, %(display_name)s, '{}'::jsonb)
+        ON CONFLICT (phone_e164) DO UPDATE SET
+            display_name = COALESCE(users.display_name, EXCLUDED.display_name),
+            updated_at = NOW()
+        RETURNING id, phone_e164, display_name, metadata, created_at, updated_at
+    ), existing AS (
+        SELECT id, user_id, title, metadata, created_at, updated_at, last_message_at
+        FROM conversations
+        WHERE user_id = (SELECT id FROM u)
+        ORDER BY last_message_at DESC NULLS LAST, updated_at DESC
+        LIMIT 1
+    ), ins AS (
+        INSERT INTO conversations (user_id)
+        SELECT id FROM u
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        RETURNING id, user_id, title, metadata, created_at, updated_at, last_message_at
+    ), c AS (
+        SELECT * FROM existing
+        UNION ALL
+        SELECT * FROM ins
+    ), m AS (
+        SELECT role, content, created_at, id
+        FROM messages
+        WHERE conversation_id = (SELECT id FROM existing)
+        ORDER BY created_at DESC, id DESC
+        LIMIT %(limit)s
+    )
+    SELECT
+        (SELECT row_to_json(u) FROM u) AS "user",
+        (SELECT row_to_json(c) FROM c) AS conversation,
+        (SELECT COALESCE(json_agg(s ORDER BY s.created_at, s.id), '[]'::json)
+         FROM m s) AS messages
+"""
+_SQL_RECENT_MESSAGES = """
+    SELECT role, content, created_at, id
+    FROM (
+        SELECT role, content, created_at, id
+        FROM messages
+        WHERE conversation_id = %s::uuid
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    ) s
+    ORDER BY created_at ASC, id ASC
+"""
+
 class SupabaseService:
     """Service for Supabase database operations"""
     
@@ -27,6 +166,9 @@ class SupabaseService:
         if self.supabase_url and self.supabase_anon_key:
             try:
                 self.client: Client = create_client(self.supabase_url, self.supabase_anon_key)
+                # Probe the REST key once here rather than discovering an
+                # invalid key via per-method fallback retries at request time.
+                self.client.table("users").select("id").limit(1).execute()
                 logger.info("Supabase client initialized successfully")
                 self.use_direct_connection = False
             except Exception as e:
@@ -38,16 +180,133 @@ class SupabaseService:
         if self.use_direct_connection and not self.database_url:
             raise ValueError("Either SUPABASE_URL/ANON_KEY or DATABASE_URL must be set in environment variables")
         
+        # Short-TTL cache for user rows keyed by phone number; every
+        # inbound webhook does this lookup and repeat users dominate, so
+        # most turns skip the round-trip entirely. Written through on
+        # create/backfill; staleness is bounded by the TTL.
+        self._user_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._user_cache_ttl = 300.0
+
+        # Parse the DSN once; the pool hands the pre-parsed params to each
+        # new connection instead of re-parsing the URL up to pool-max times.
+        self._dsn_params: Optional[Dict[str, Any]] = (
+            psycopg2.extensions.parse_dsn(self.database_url) if self.database_url else None
+        )
+
+        # Job read caches, invalidated by a per-user write version: any job
+        # write bumps the version, so stale entries die on the next lookup
+        # without key scans. Mirrors JobService's write-version scheme.
+        self._jobs_version: Dict[str, int] = {}
+        self._stats_cache: "OrderedDict[str, tuple[float, int, Dict[str, int]]]" = OrderedDict()
+        self._stats_cache_ttl = 60.0
+        # Search results keyed by (user, write version, filters); the
+        # version in the key makes invalidation free on write
+        self._search_cache: "OrderedDict[tuple, tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._search_cache_ttl = 60.0
+
+        # Lazily-started background writer for non-critical writes (the
+        # conversation recency touches): callers should not wait a DB
+        # round-trip for bookkeeping the reply does not depend on.
+        self._bg_queue: Optional[asyncio.Queue] = None
+        self._bg_worker: Optional[asyncio.Task] = None
+
+        # Warm connection pool for the direct path: per-call
+        # psycopg2.connect pays TCP+TLS+auth round-trips on every query
+        # (and the old code never closed those connections). Lazily built
+        # so the Supabase-client path doesn't require DATABASE_URL; the lock
+        # keeps concurrent first calls from each building (and leaking) a pool.
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
         if self.use_direct_connection:
             logger.info("Using direct PostgreSQL connection")
         else:
             logger.info("Using Supabase client")
 
+    def _cache_user(self, user: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Write a user row through to the phone cache (bounded, oldest out)."""
+        if user and user.get("phone_e164"):
+            self._user_cache[user["phone_e164"]] = (time.monotonic() + self._user_cache_ttl, user)
+            self._user_cache.move_to_end(user["phone_e164"])
+            while len(self._user_cache) > 1024:
+                self._user_cache.popitem(last=False)
+        return user
+
+    def _bump_jobs_version(self, user_id: str) -> None:
+        """Invalidate cached job reads for this user after any job write."""
+        self._jobs_version[user_id] = self._jobs_version.get(user_id, 0) + 1
+
+    def _cache_stats(self, user_id: str, version: int, stats: Dict[str, int]) -> Dict[str, int]:
+        """Store a stats histogram against the write version it was read at."""
+        self._stats_cache[user_id] = (time.monotonic() + self._stats_cache_ttl, version, stats)
+        self._stats_cache.move_to_end(user_id)
+        while len(self._stats_cache) > 1024:
+            self._stats_cache.popitem(last=False)
+        return stats
+
+    def _cache_search(self, key: tuple, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Store a search result under its (user, version, filters) key."""
+        self._search_cache[key] = (time.monotonic() + self._search_cache_ttl, data)
+        self._search_cache.move_to_end(key)
+        while len(self._search_cache) > 512:
+            self._search_cache.popitem(last=False)
+        return data
+
+    def _enqueue_write(self, fn) -> None:
+        """Run a fire-and-forget write off the request path.
+
+        Queued writes are drained by a single worker task so they stay
+        ordered and can't stampede the pool; when the queue is full the
+        write is dropped with a warning rather than blocking the caller.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            fn()
+            return
+        if self._bg_queue is None:
+            self._bg_queue = asyncio.Queue(maxsize=256)
+            self._bg_worker = loop.create_task(self._bg_writer_loop())
+        try:
+            self._bg_queue.put_nowait(fn)
+        except asyncio.QueueFull:
+            logger.warning("Background write queue full; dropping non-critical write")
+
+    async def _bg_writer_loop(self) -> None:
+        while True:
+            fn = await self._bg_queue.get()
+            try:
+                await asyncio.to_thread(fn)
+            except Exception as e:
+                logger.warning(f"Background write failed: {e}")
+            finally:
+                self._bg_queue.task_done()
+
+    @contextmanager
+    def _conn(self):
+        """Borrow a pooled connection; commit on success, roll back on error."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(1, 20, **self._dsn_params)
+        conn = self._pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn)
+
     # =====================
     # Users
     # =====================
     async def get_user_by_phone(self, phone_e164: str) -> Optional[Dict[str, Any]]:
         """Fetch a user row by phone in E.164 format."""
+        cached = self._user_cache.get(phone_e164)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
         try:
             if not self.use_direct_connection:
                 result = (
@@ -55,29 +314,26 @@ class SupabaseService:
                     .table("users")
                     .select("id, phone_e164, display_name, metadata, created_at, updated_at")
                     .eq("phone_e164", phone_e164)
-                    .single()
+                    .maybe_single()
                     .execute()
                 )
-                return result.data if result.data else None
+                # maybe_single returns an empty result on miss instead of
+                # raising the 406 that .single() produces for zero rows
+                data = result.data if result is not None else None
+                return self._cache_user(data or None)
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            SELECT id, phone_e164, display_name, metadata, created_at, updated_at
-                            FROM users
-                            WHERE phone_e164 = %s
-                            LIMIT 1
-                            """,
-                            (phone_e164,)
-                        )
-                        row = cur.fetchone()
-                        return dict(row) if row else None
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                _SQL_GET_USER_BY_PHONE,
+                                (phone_e164,)
+                            )
+                            row = cur.fetchone()
+                            return dict(row) if row else None
+                return self._cache_user(await asyncio.to_thread(_direct))
         except Exception as e:
             logger.error(f"Error fetching user by phone: {e}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.get_user_by_phone(phone_e164)
             return None
 
     async def create_user(self, *, phone_e164: str, display_name: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
@@ -90,32 +346,31 @@ class SupabaseService:
                     "metadata": metadata or {},
                 }
                 result = self.client.table("users").insert(payload).execute()
-                return result.data[0] if result.data else None
+                return self._cache_user(result.data[0] if result.data else None)
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            INSERT INTO users (phone_e164, display_name, metadata)
-                            VALUES (%s, %s, %s::jsonb)
-                            ON CONFLICT (phone_e164) DO UPDATE SET
-                                display_name = COALESCE(EXCLUDED.display_name, users.display_name),
-                                updated_at = NOW()
-                            RETURNING id, phone_e164, display_name, metadata, created_at, updated_at
-                            """,
-                            (phone_e164, display_name, Json(metadata or {}))
-                        )
-                        row = cur.fetchone()
-                        return dict(row) if row else None
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                _SQL_UPSERT_USER,
+                                (phone_e164, display_name, Json(metadata or {}))
+                            )
+                            row = cur.fetchone()
+                            return dict(row) if row else None
+                return self._cache_user(await asyncio.to_thread(_direct))
         except Exception as e:
             logger.error(f"Error creating user: {e}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.create_user(phone_e164=phone_e164, display_name=display_name, metadata=metadata)
             return None
 
     async def get_or_create_user_by_phone(self, phone_e164: str, *, display_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        """Idempotently fetch or create a user for this phone number."""
+        """Idempotently fetch or create a user for this phone number.
+
+        On the direct path this is one upsert round-trip: the ON CONFLICT
+        clause keeps an existing display_name and backfills it only when
+        NULL, which is exactly the old SELECT/UPDATE/INSERT dance.
+        """
+        if self.use_direct_connection:
+            return await self.create_user(phone_e164=phone_e164, display_name=display_name)
         user = await self.get_user_by_phone(phone_e164)
         if user:
             # Optionally backfill display_name
@@ -126,19 +381,23 @@ class SupabaseService:
                         if upd.data:
                             user = upd.data[0]
                     else:
-                        with psycopg2.connect(self.database_url) as conn:
-                            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                                cur.execute(
-                                    """
-                                    UPDATE users SET display_name = %s, updated_at = NOW()
-                                    WHERE id = %s::uuid
-                                    RETURNING id, phone_e164, display_name, metadata, created_at, updated_at
-                                    """,
-                                    (display_name, user["id"])
-                                )
-                                row = cur.fetchone()
-                                if row:
-                                    user = dict(row)
+                        def _direct():
+                            with self._conn() as conn:
+                                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                                    cur.execute(
+                                        """
+                                        UPDATE users SET display_name = %s, updated_at = NOW()
+                                        WHERE id = %s::uuid
+                                        RETURNING id, phone_e164, display_name, metadata, created_at, updated_at
+                                        """,
+                                        (display_name, user["id"])
+                                    )
+                                    row = cur.fetchone()
+                                    return dict(row) if row else None
+                        updated = await asyncio.to_thread(_direct)
+                        if updated:
+                            user = updated
+                            self._cache_user(user)
                 except Exception:
                     pass
             return user
@@ -156,26 +415,26 @@ class SupabaseService:
                     .table("conversations")
                     .select("metadata")
                     .eq("id", conversation_id)
-                    .single()
+                    .maybe_single()
                     .execute()
                 )
-                return result.data.get("metadata", {}) if result.data else {}
+                data = result.data if result is not None else None
+                return data.get("metadata", {}) if data else {}
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            SELECT metadata FROM conversations WHERE id = %s::uuid
-                            """,
-                            (conversation_id,)
-                        )
-                        row = cur.fetchone()
-                        return dict(row).get("metadata", {}) if row else {}
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                """
+                                SELECT metadata FROM conversations WHERE id = %s::uuid
+                                """,
+                                (conversation_id,)
+                            )
+                            row = cur.fetchone()
+                            return dict(row).get("metadata", {}) if row else {}
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error fetching conversation metadata: {e}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.get_conversation_metadata(conversation_id)
             return {}
 
     async def update_conversation_metadata(self, conversation_id: str, metadata: Dict[str, Any]) -> bool:
@@ -191,22 +450,21 @@ class SupabaseService:
                 )
                 return bool(result.data)
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            UPDATE conversations SET metadata = %s::jsonb, updated_at = NOW() WHERE id = %s::uuid
-                            RETURNING id
-                            """,
-                            (Json(metadata), conversation_id)
-                        )
-                        row = cur.fetchone()
-                        return bool(row)
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                """
+                                UPDATE conversations SET metadata = %s::jsonb, updated_at = NOW() WHERE id = %s::uuid
+                                RETURNING id
+                                """,
+                                (Json(metadata), conversation_id)
+                            )
+                            row = cur.fetchone()
+                            return bool(row)
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error updating conversation metadata: {e}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.update_conversation_metadata(conversation_id, metadata)
             return False
     async def create_conversation(self, user_id: str, title: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Create a new conversation row"""
@@ -220,24 +478,22 @@ class SupabaseService:
                 result = self.client.table("conversations").insert(payload).execute()
                 return result.data[0] if result.data else None
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            INSERT INTO conversations (user_id, title, metadata)
-                            VALUES (%s::uuid, %s, %s::jsonb)
-                            RETURNING id, user_id, title, metadata, created_at, updated_at, last_message_at
-                            """,
-                            (user_id, title, Json(metadata or {}))
-                        )
-                        row = cur.fetchone()
-                        return dict(row) if row else None
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                """
+                                INSERT INTO conversations (user_id, title, metadata)
+                                VALUES (%s::uuid, %s, %s::jsonb)
+                                RETURNING id, user_id, title, metadata, created_at, updated_at, last_message_at
+                                """,
+                                (user_id, title, Json(metadata or {}))
+                            )
+                            row = cur.fetchone()
+                            return dict(row) if row else None
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error creating conversation: {e}")
-            # Fallback to direct DB if REST key invalid
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.create_conversation(user_id, title, metadata)
             return None
 
     async def get_or_create_recent_conversation(self, user_id: str) -> Optional[Dict[str, Any]]:
@@ -258,25 +514,60 @@ class SupabaseService:
                     return result.data[0]
                 return await self.create_conversation(user_id)
             else:
-                with psycopg2.connect(self.database_url) as conn:
+                # Single round-trip: select the newest conversation and, only
+                # when none exists, insert one in the same statement. Atomic,
+                # so two concurrent webhooks for a new user cannot both create
+                # an empty conversation.
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                _SQL_GET_OR_CREATE_CONVERSATION,
+                                {"user_id": user_id}
+                            )
+                            row = cur.fetchone()
+                            return dict(row) if row else None
+                return await asyncio.to_thread(_direct)
+        except Exception as e:
+            logger.error(f"Error getting/creating recent conversation: {e}")
+            return await self.create_conversation(user_id)
+
+    async def fetch_chat_context(self, phone_e164: str, limit: int = 10, *, display_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Load everything a chat turn needs in one round-trip.
+
+        Returns {"user", "conversation", "messages"} with messages oldest
+        first. On the direct path this is a single CTE that upserts the
+        user, gets-or-creates the most recent conversation, and pulls the
+        last `limit` messages; the PostgREST branch falls back to the
+        three individual calls.
+        """
+        try:
+            if not self.use_direct_connection:
+                user = await self.get_or_create_user_by_phone(phone_e164, display_name=display_name)
+                if not user:
+                    return None
+                conversation = await self.get_or_create_recent_conversation(user["id"])
+                messages = (
+                    await self.get_recent_messages(conversation["id"], limit)
+                    if conversation else []
+                )
+                return {"user": user, "conversation": conversation, "messages": messages}
+            def _direct():
+                with self._conn() as conn:
                     with conn.cursor(cursor_factory=RealDictCursor) as cur:
                         cur.execute(
-                            """
-                            SELECT id, user_id, title, metadata, created_at, updated_at, last_message_at
-                            FROM conversations
-                            WHERE user_id = %s::uuid
-                            ORDER BY last_message_at DESC NULLS LAST, updated_at DESC
-                            LIMIT 1
-                            """,
-                            (user_id,)
+                            _SQL_CHAT_CONTEXT,
+                            {"phone_e164": phone_e164, "display_name": display_name, "limit": limit}
                         )
                         row = cur.fetchone()
-                        if row:
-                            return dict(row)
-                        return await self.create_conversation(user_id)
+                        return dict(row) if row else None
+            ctx = await asyncio.to_thread(_direct)
+            if ctx:
+                self._cache_user(ctx.get("user"))
+            return ctx
         except Exception as e:
-            logger.error(f"Error getting/creating recent conversation: {e}")
-            return await self.create_conversation(user_id)
+            logger.error(f"Error fetching chat context: {e}")
+            return None
 
     async def add_message(self, conversation_id: str, user_id: str, role: str, content: str, tool_calls: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Insert a message into messages table"""
@@ -290,47 +581,103 @@ class SupabaseService:
                     "tool_calls": tool_calls or None
                 }
                 result = self.client.table("messages").insert(payload).execute()
-                # Update conversation recency
-                try:
-                    now_iso = datetime.now(timezone.utc).isoformat()
-                    self.client.table("conversations").update({"last_message_at": now_iso, "updated_at": now_iso}).eq("id", conversation_id).execute()
-                except Exception:
-                    pass
+                # Recency touch runs on the background writer; the RPC stamps
+                # now() on the server, so no Python-built timestamp crosses
+                # the wire and the caller doesn't wait for it
+                self._enqueue_write(
+                    lambda: self.client.rpc("touch_conversation", {"conv_id": conversation_id}).execute()
+                )
                 return result.data[0] if result.data else None
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            INSERT INTO messages (conversation_id, user_id, role, content, tool_calls)
-                            VALUES (%s::uuid, %s::uuid, %s, %s, %s::jsonb)
-                            RETURNING id, conversation_id, user_id, role, content, tool_calls, created_at
-                            """,
-                            (conversation_id, user_id, role, content, Json(tool_calls) if tool_calls is not None else None)
-                        )
-                        row = cur.fetchone()
-                        # Update conversation recency
-                        try:
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            # One round-trip: insert the message and touch the
+                            # conversation's recency columns in the same statement
                             cur.execute(
-                                """
-                                UPDATE conversations
-                                SET last_message_at = NOW(), updated_at = NOW()
-                                WHERE id = %s::uuid
-                                RETURNING id
-                                """,
-                                (conversation_id,)
+                                _SQL_ADD_MESSAGE,
+                                (conversation_id, user_id, role, content, Json(tool_calls) if tool_calls is not None else None, conversation_id)
                             )
-                            conn.commit()
-                        except Exception:
-                            conn.rollback()
-                        return dict(row) if row else None
+                            row = cur.fetchone()
+                            return dict(row) if row else None
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error adding message: {e}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.add_message(conversation_id, user_id, role, content, tool_calls)
             return None
 
+    async def add_messages(self, rows: List[Dict[str, Any]]) -> int:
+        """Bulk-insert messages (e.g. transcript backfill) in one statement.
+
+        rows: dicts with conversation_id, user_id, role, content, and
+        optional tool_calls. Returns the number of rows inserted. Use
+        add_message for single live turns; this path batches the INSERT
+        and touches each affected conversation once instead of per row.
+        """
+        if not rows:
+            return 0
+        try:
+            conversation_ids = list({r["conversation_id"] for r in rows})
+            if not self.use_direct_connection:
+                payload = [
+                    {
+                        "conversation_id": r["conversation_id"],
+                        "user_id": r["user_id"],
+                        "role": r["role"],
+                        "content": r["content"],
+                        "tool_calls": r.get("tool_calls") or None,
+                    }
+                    for r in rows
+                ]
+                result = self.client.table("messages").insert(payload).execute()
+                ids = list(conversation_ids)
+                self._enqueue_write(
+                    lambda: self.client.rpc("touch_conversations", {"conv_ids": ids}).execute()
+                )
+                return len(result.data or [])
+            else:
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor() as cur:
+                            execute_values(
+                                cur,
+                                "INSERT INTO messages (conversation_id, user_id, role, content, tool_calls) VALUES %s",
+                                [
+                                    (
+                                        r["conversation_id"],
+                                        r["user_id"],
+                                        r["role"],
+                                        r["content"],
+                                        Json(r["tool_calls"]) if r.get("tool_calls") else None,
+                                    )
+                                    for r in rows
+                                ],
+                                template="(%s::uuid, %s::uuid, %s, %s, %s::jsonb)",
+                                page_size=1000,
+                            )
+                            cur.execute(
+                                "UPDATE conversations SET last_message_at = NOW(), updated_at = NOW() WHERE id = ANY(%s::uuid[])",
+                                (conversation_ids,),
+                            )
+                            return len(rows)
+                return await asyncio.to_thread(_direct)
+        except Exception as e:
+            logger.error(f"Error bulk-adding messages: {e}")
+            return 0
+
+    async def record_turn(self, conversation_id: str, user_id: str, role: str, content: str,
+                          limit: int = 10) -> tuple:
+        """Persist an inbound message and load recent history concurrently.
+
+        The two queries are independent — the history a reply is built
+        from should predate the message being stored — so running them
+        via asyncio.gather overlaps the round-trips. Returns
+        (inserted_message, prior_messages).
+        """
+        return await asyncio.gather(
+            self.add_message(conversation_id, user_id, role, content),
+            self.get_recent_messages(conversation_id, limit),
+        )
+
     async def get_recent_messages(self, conversation_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Fetch recent messages for context"""
         try:
@@ -345,32 +692,29 @@ class SupabaseService:
                     .limit(limit)
                     .execute()
                 )
-                return list(reversed(result.data)) if result.data else []
+                if not result.data:
+                    return []
+                return sorted(result.data, key=lambda r: (r["created_at"], r["id"]))
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            SELECT role, content, created_at, id
-                            FROM messages
-                            WHERE conversation_id = %s::uuid
-                            ORDER BY created_at DESC, id DESC
-                            LIMIT %s
-                            """,
-                            (conversation_id, limit)
-                        )
-                        rows = cur.fetchall()
-                        data = [dict(r) for r in rows] if rows else []
-                        return list(reversed(data))
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                _SQL_RECENT_MESSAGES,
+                                (conversation_id, limit)
+                            )
+                            rows = cur.fetchall()
+                            # Already chronological: the subquery takes the
+                            # newest N, the outer ORDER BY flips them back
+                            return [dict(r) for r in rows] if rows else []
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error fetching recent messages: {e}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.get_recent_messages(conversation_id, limit)
             return []
     
     async def create_job(self, job_data: JobCreate, user_id: str) -> Optional[Dict[str, Any]]:
         """Create a new job entry"""
+        self._bump_jobs_version(user_id)
         try:
             if not self.use_direct_connection:
                 data = {
@@ -389,35 +733,91 @@ class SupabaseService:
                     logger.error("No data returned from job creation")
                     return None
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            INSERT INTO jobs (user_id, job_title, company_name, job_link, job_description, status)
-                            VALUES (%s::uuid, %s, %s, %s, %s, %s)
-                            RETURNING id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
-                            """,
-                            (
-                                user_id,
-                                job_data.job_title,
-                                job_data.company_name,
-                                job_data.job_link,
-                                job_data.job_description,
-                                job_data.status.value if job_data.status else "applied"
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                """
+                                INSERT INTO jobs (user_id, job_title, company_name, job_link, job_description, status)
+                                VALUES (%s::uuid, %s, %s, %s, %s, %s)
+                                RETURNING id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
+                                """,
+                                (
+                                    user_id,
+                                    job_data.job_title,
+                                    job_data.company_name,
+                                    job_data.job_link,
+                                    job_data.job_description,
+                                    job_data.status.value if job_data.status else "applied"
+                                )
                             )
-                        )
-                        row = cur.fetchone()
-                        return dict(row) if row else None
+                            row = cur.fetchone()
+                            return dict(row) if row else None
                 
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error creating job: {str(e)}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.create_job(job_data, user_id)
             return None
     
+    async def bulk_create_jobs(self, jobs: List[JobCreate], user_id: str) -> List[Dict[str, Any]]:
+        """Insert many jobs (e.g. an import) in one statement.
+
+        Keeps create_job for single interactive writes; imports of N jobs
+        cost one round-trip here instead of N.
+        """
+        if not jobs:
+            return []
+        self._bump_jobs_version(user_id)
+        try:
+            if not self.use_direct_connection:
+                payload = [
+                    {
+                        "user_id": user_id,
+                        "job_title": j.job_title,
+                        "company_name": j.company_name,
+                        "job_link": j.job_link,
+                        "job_description": j.job_description,
+                        "status": j.status.value if j.status else "applied",
+                    }
+                    for j in jobs
+                ]
+                result = self.client.table("jobs").insert(payload).execute()
+                return result.data or []
+            else:
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            rows = execute_values(
+                                cur,
+                                """
+                                INSERT INTO jobs (user_id, job_title, company_name, job_link, job_description, status)
+                                VALUES %s
+                                RETURNING id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
+                                """,
+                                [
+                                    (
+                                        user_id,
+                                        j.job_title,
+                                        j.company_name,
+                                        j.job_link,
+                                        j.job_description,
+                                        j.status.value if j.status else "applied",
+                                    )
+                                    for j in jobs
+                                ],
+                                template="(%s::uuid, %s, %s, %s, %s, %s)",
+                                page_size=1000,
+                                fetch=True,
+                            )
+                            return [dict(r) for r in rows] if rows else []
+                return await asyncio.to_thread(_direct)
+        except Exception as e:
+            logger.error(f"Error bulk-creating jobs: {e}")
+            return []
+
     async def update_job_status(self, job_id: str, status: JobStatus, user_id: str) -> Optional[Dict[str, Any]]:
         """Update job status"""
+        self._bump_jobs_version(user_id)
         try:
             if not self.use_direct_connection:
                 data = {
@@ -432,35 +832,52 @@ class SupabaseService:
                     logger.error(f"No job found with id {job_id} for user {user_id}")
                     return None
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        cur.execute(
-                            """
-                            UPDATE jobs
-                            SET status = %s, last_updated = NOW()
-                            WHERE id = %s::uuid AND user_id = %s::uuid
-                            RETURNING id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
-                            """,
-                            (status.value, job_id, user_id)
-                        )
-                        row = cur.fetchone()
-                        return dict(row) if row else None
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                """
+                                UPDATE jobs
+                                SET status = %s, last_updated = NOW()
+                                WHERE id = %s::uuid AND user_id = %s::uuid
+                                RETURNING id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
+                                """,
+                                (status.value, job_id, user_id)
+                            )
+                            row = cur.fetchone()
+                            return dict(row) if row else None
                 
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error updating job status: {str(e)}")
-            if not self.use_direct_connection and self.database_url and "Invalid API key" in str(e):
-                self.use_direct_connection = True
-                return await self.update_job_status(job_id, status, user_id)
             return None
     
-    async def get_user_jobs(self, user_id: str, status: Optional[JobStatus] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get jobs for a user, optionally filtered by status and limited."""
+    async def get_user_jobs(
+        self,
+        user_id: str,
+        status: Optional[JobStatus] = None,
+        limit: Optional[int] = None,
+        after_date_added: Optional[Any] = None,
+        after_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get jobs for a user, optionally filtered by status and limited.
+
+        after_date_added/after_id form an optional keyset cursor (the
+        date_added and id of the last row of the previous page), so callers
+        can walk a large job list in bounded pages instead of one unbounded
+        read. Results keep the date_added DESC ordering.
+        """
         try:
             if not self.use_direct_connection:
-                query = self.client.table("jobs").select("*").eq("user_id", user_id)
+                query = self.client.table("jobs").select(_JOB_LIST_COLS).eq("user_id", user_id)
                 if status:
                     query = query.eq("status", status.value)
-                query = query.order("date_added", desc=True)
+                if after_date_added is not None:
+                    # PostgREST can't express the (date_added, id) row
+                    # comparison; filtering on date_added alone only risks
+                    # dropping ties within the same timestamp
+                    query = query.lt("date_added", after_date_added)
+                query = query.order("date_added", desc=True).order("id", desc=True)
                 if limit:
                     query = query.limit(limit)
                 result = query.execute()
@@ -471,32 +888,30 @@ class SupabaseService:
                     logger.info(f"No jobs found for user {user_id}")
                     return []
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        if status:
-                            cur.execute(
-                                """
-                                SELECT id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
-                                FROM jobs
-                                WHERE user_id = %s::uuid AND status = %s
-                                ORDER BY date_added DESC
-                                """ + (" LIMIT %s" if limit else ""),
-                                (user_id, status.value) + ((limit,) if limit else tuple())
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            where_clauses = ["user_id = %s::uuid"]
+                            params: list = [user_id]
+                            if status:
+                                where_clauses.append("status = %s")
+                                params.append(status.value)
+                            if after_date_added is not None and after_id is not None:
+                                where_clauses.append("(date_added, id) < (%s, %s::uuid)")
+                                params.extend([after_date_added, after_id])
+                            sql = (
+                                f"SELECT {_JOB_LIST_COLS} "
+                                "FROM jobs WHERE " + " AND ".join(where_clauses) + " ORDER BY date_added DESC, id DESC"
                             )
-                        else:
-                            cur.execute(
-                                """
-                                SELECT id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated
-                                FROM jobs
-                                WHERE user_id = %s::uuid
-                                ORDER BY date_added DESC
-                                """ + (" LIMIT %s" if limit else ""),
-                                (user_id,) + ((limit,) if limit else tuple())
-                            )
-                        rows = cur.fetchall()
-                        data = [dict(r) for r in rows] if rows else []
-                        logger.info(f"Retrieved {len(data)} jobs for user {user_id} (direct DB)")
-                        return data
+                            if limit:
+                                sql += " LIMIT %s"
+                                params.append(limit)
+                            cur.execute(sql, tuple(params))
+                            rows = cur.fetchall()
+                            data = [dict(r) for r in rows] if rows else []
+                            logger.info(f"Retrieved {len(data)} jobs for user {user_id} (direct DB)")
+                            return data
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error retrieving jobs: {str(e)}")
             return []
@@ -518,18 +933,29 @@ class SupabaseService:
     
     async def delete_job(self, job_id: str, user_id: str) -> bool:
         """Delete a specific job by ID"""
+        self._bump_jobs_version(user_id)
         try:
             if not self.use_direct_connection:
-                result = self.client.table("jobs").delete().eq("id", job_id).eq("user_id", user_id).execute()
-                return bool(result.data)
+                # count=exact + returning=minimal: the response carries just a
+                # row count instead of materializing the deleted row
+                result = (
+                    self.client.table("jobs")
+                    .delete(count="exact", returning="minimal")
+                    .eq("id", job_id)
+                    .eq("user_id", user_id)
+                    .execute()
+                )
+                return bool(result.count)
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(
-                            "DELETE FROM jobs WHERE id = %s::uuid AND user_id = %s::uuid",
-                            (job_id, user_id)
-                        )
-                        return cur.rowcount > 0
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor() as cur:
+                            cur.execute(
+                                "DELETE FROM jobs WHERE id = %s::uuid AND user_id = %s::uuid",
+                                (job_id, user_id)
+                            )
+                            return cur.rowcount > 0
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error deleting job {job_id}: {str(e)}")
             return False
@@ -538,118 +964,158 @@ class SupabaseService:
         """Delete all jobs with a specific status for a user.
         Returns: (count_deleted, list_of_deleted_job_titles)
         """
+        self._bump_jobs_version(user_id)
         try:
-            # First get the jobs to be deleted for confirmation
-            jobs_to_delete = await self.search_jobs(user_id=user_id, status_filter=status)
-            if not jobs_to_delete:
-                return 0, []
-            
-            job_titles = [f"{j['job_title']} at {j['company_name']}" for j in jobs_to_delete]
-            job_ids = [j['id'] for j in jobs_to_delete]
-            
+            # The DELETE itself returns the rows it removed, so no pre-fetch
+            # SELECT is needed to report what was deleted
             if not self.use_direct_connection:
-                # Delete in Supabase
-                for job_id in job_ids:
-                    result = self.client.table("jobs").delete().eq("id", job_id).eq("user_id", user_id).execute()
-                return len(job_ids), job_titles
+                result = self.client.table("jobs").delete().eq("user_id", user_id).eq("status", status).execute()
+                deleted = result.data or []
+                return len(deleted), [f"{j['job_title']} at {j['company_name']}" for j in deleted]
             else:
-                # Delete via direct connection
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor() as cur:
-                        cur.execute(
-                            "DELETE FROM jobs WHERE user_id = %s::uuid AND status = %s",
-                            (user_id, status)
-                        )
-                        return cur.rowcount, job_titles
-                        
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                            cur.execute(
+                                """
+                                DELETE FROM jobs
+                                WHERE user_id = %s::uuid AND status = %s
+                                RETURNING job_title, company_name
+                                """,
+                                (user_id, status)
+                            )
+                            rows = cur.fetchall()
+                            return len(rows), [f"{r['job_title']} at {r['company_name']}" for r in rows]
+                return await asyncio.to_thread(_direct)
         except Exception as e:
             logger.error(f"Error deleting jobs with status {status}: {str(e)}")
             return 0, []
     
     async def search_jobs(self, user_id: str, company_name: Optional[str] = None, job_title: Optional[str] = None, 
-                         status_filter: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Search jobs by company name, job title, or status."""
+                         status_filter: Optional[str] = None, limit: Optional[int] = None,
+                         after_date_added: Optional[Any] = None, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search jobs by company name, job title, or status.
+
+        Accepts the same optional keyset cursor as get_user_jobs for
+        bounded paging over large result sets.
+        """
+        key = (
+            user_id, self._jobs_version.get(user_id, 0),
+            company_name, job_title, status_filter, limit,
+            str(after_date_added) if after_date_added is not None else None, after_id,
+        )
+        cached = self._search_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
         try:
             if not self.use_direct_connection:
-                query = self.client.table("jobs").select("*").eq("user_id", user_id)
+                query = self.client.table("jobs").select(_JOB_LIST_COLS).eq("user_id", user_id)
                 if company_name:
                     query = query.ilike("company_name", f"%{company_name}%")
                 if job_title:
                     query = query.ilike("job_title", f"%{job_title}%")
                 if status_filter:
                     query = query.eq("status", status_filter)
-                query = query.order("date_added", desc=True)
+                if after_date_added is not None:
+                    query = query.lt("date_added", after_date_added)
+                query = query.order("date_added", desc=True).order("id", desc=True)
                 if limit:
                     query = query.limit(limit)
                 result = query.execute()
                 if result.data:
                     logger.info(f"Found {len(result.data)} jobs matching search criteria")
-                    return result.data
+                    return self._cache_search(key, result.data)
                 else:
                     logger.info("No jobs found matching search criteria")
-                    return []
+                    return self._cache_search(key, [])
             else:
-                with psycopg2.connect(self.database_url) as conn:
-                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                        params = [user_id]
-                        where_clauses = ["user_id = %s::uuid"]
-                        if company_name:
-                            where_clauses.append("company_name ILIKE %s")
-                            params.append(f"%{company_name}%")
-                        if job_title:
-                            where_clauses.append("job_title ILIKE %s")
-                            params.append(f"%{job_title}%")
-                        if status_filter:
-                            where_clauses.append("status = %s")
-                            params.append(status_filter)
-                        sql = (
-                            "SELECT id, user_id, job_title, company_name, job_link, job_description, status, date_added, last_updated "
-                            "FROM jobs WHERE " + " AND ".join(where_clauses) + " ORDER BY date_added DESC"
-                        )
-                        if limit:
-                            sql += " LIMIT %s"
-                            params.append(limit)
-                        cur.execute(sql, tuple(params))
-                        rows = cur.fetchall()
-                        data = [dict(r) for r in rows] if rows else []
-                        logger.info(f"Found {len(data)} jobs matching search criteria (direct DB)")
-                        return data
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor() as cur:
+                            has_cursor = after_date_added is not None and after_id is not None
+                            sql = _search_jobs_sql(
+                                bool(company_name), bool(job_title),
+                                bool(status_filter), has_cursor,
+                                aggregate=True,
+                            )
+                            params = [user_id]
+                            if company_name:
+                                params.append(f"%{company_name}%")
+                            if job_title:
+                                params.append(f"%{job_title}%")
+                            if status_filter:
+                                params.append(status_filter)
+                            if has_cursor:
+                                params.extend([after_date_added, after_id])
+                            params.append(limit if limit else None)
+                            cur.execute(sql, tuple(params))
+                            data = cur.fetchone()[0]
+                            logger.info(f"Found {len(data)} jobs matching search criteria (direct DB)")
+                            return data
+                return self._cache_search(key, await asyncio.to_thread(_direct))
         except Exception as e:
             logger.error(f"Error searching jobs: {str(e)}")
             return []
     
-    async def delete_job(self, job_id: str, user_id: str) -> bool:
-        """Delete a job entry"""
-        try:
-            result = self.client.table("jobs").delete().eq("id", job_id).eq("user_id", user_id).execute()
-            
-            if result.data:
-                logger.info(f"Deleted job {job_id}")
-                return True
-            else:
-                logger.error(f"No job found with id {job_id} for user {user_id}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error deleting job: {str(e)}")
-            return False
-    
+    async def search_jobs_stream(self, user_id: str, company_name: Optional[str] = None,
+                                 job_title: Optional[str] = None, status_filter: Optional[str] = None,
+                                 batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching jobs incrementally in pages of `batch_size`.
+
+        Unbounded searches through search_jobs materialize every match at
+        once; this walks the same query with the keyset cursor, holding
+        only one page in memory at a time, and works on both branches.
+        """
+        after_date_added = None
+        after_id = None
+        while True:
+            page = await self.search_jobs(
+                user_id, company_name, job_title, status_filter,
+                limit=batch_size, after_date_added=after_date_added, after_id=after_id,
+            )
+            for row in page:
+                yield row
+            if len(page) < batch_size:
+                return
+            after_date_added = page[-1]["date_added"]
+            after_id = page[-1]["id"]
+
     async def get_job_stats(self, user_id: str) -> Dict[str, int]:
         """Get job statistics for a user"""
+        version = self._jobs_version.get(user_id, 0)
+        cached = self._stats_cache.get(user_id)
+        if cached and cached[1] == version and cached[0] > time.monotonic():
+            return cached[2]
         try:
-            result = self.client.table("jobs").select("status").eq("user_id", user_id).execute()
-            
-            if not result.data:
-                return {}
-            
-            stats = {}
-            for job in result.data:
-                status = job.get("status", "unknown")
-                stats[status] = stats.get(status, 0) + 1
-            
-            logger.info(f"Retrieved job stats for user {user_id}: {stats}")
-            return stats
-            
+            if not self.use_direct_connection:
+                # PostgREST cannot express GROUP BY without an RPC, so this
+                # branch still pulls the status column and counts client-side
+                result = self.client.table("jobs").select("status").eq("user_id", user_id).execute()
+
+                if not result.data:
+                    return self._cache_stats(user_id, version, {})
+
+                # Counter runs the tally loop in C, one pass, no per-row
+                # double dict lookup
+                stats = dict(Counter(job.get("status", "unknown") for job in result.data))
+
+                logger.info(f"Retrieved job stats for user {user_id}: {stats}")
+                return self._cache_stats(user_id, version, stats)
+            else:
+                # Aggregate server-side: only the ~5-row histogram crosses
+                # the wire instead of one row per job
+                def _direct():
+                    with self._conn() as conn:
+                        with conn.cursor() as cur:
+                            cur.execute(
+                                "SELECT status, COUNT(*) FROM jobs WHERE user_id = %s::uuid GROUP BY status",
+                                (user_id,)
+                            )
+                            return {row[0] or "unknown": row[1] for row in cur.fetchall()}
+                stats = await asyncio.to_thread(_direct)
+                logger.info(f"Retrieved job stats for user {user_id}: {stats}")
+                return self._cache_stats(user_id, version, stats)
+
         except Exception as e:
             logger.error(f"Error retrieving job stats: {str(e)}")
             return {}
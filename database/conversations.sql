@@ -25,6 +25,22 @@ begin
 end;
 $$ language plpgsql;
 
+-- Server-side recency touch so clients don't ship a Python-built
+-- timestamp with every message; callable from PostgREST as an RPC
+create or replace function touch_conversation(conv_id uuid)
+returns void as $$
+  update conversations
+  set last_message_at = now(), updated_at = now()
+  where id = conv_id;
+$$ language sql;
+
+create or replace function touch_conversations(conv_ids uuid[])
+returns void as $$
+  update conversations
+  set last_message_at = now(), updated_at = now()
+  where id = any(conv_ids);
+$$ language sql;
+
 drop trigger if exists trg_conversations_updated on conversations;
 create trigger trg_conversations_updated
 before update on conversations
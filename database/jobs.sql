@@ -16,7 +16,14 @@ create table if not exists jobs (
 );
 
 create index if not exists idx_jobs_user_date on jobs (user_id, date_added desc);
+create index if not exists idx_jobs_user_status_date on jobs (user_id, status, date_added desc);
 create index if not exists idx_jobs_user_company on jobs (user_id, company_name);
 create index if not exists idx_jobs_user_title on jobs (user_id, job_title);
 
+-- Trigram indexes so the %term% ILIKE filters in search_jobs hit a
+-- bitmap index scan instead of scanning every row for the user
+create extension if not exists pg_trgm;
+create index if not exists idx_jobs_company_trgm on jobs using gin (company_name gin_trgm_ops);
+create index if not exists idx_jobs_title_trgm on jobs using gin (job_title gin_trgm_ops);
+
 
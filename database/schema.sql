@@ -56,9 +56,16 @@ create table if not exists jobs (
 );
 
 create index if not exists idx_jobs_user_date on jobs (user_id, date_added desc);
+create index if not exists idx_jobs_user_status_date on jobs (user_id, status, date_added desc);
 create index if not exists idx_jobs_user_company on jobs (user_id, company_name);
 create index if not exists idx_jobs_user_title on jobs (user_id, job_title);
 
+-- Trigram indexes so the %term% ILIKE filters in search_jobs hit a
+-- bitmap index scan instead of scanning every row for the user
+create extension if not exists pg_trgm;
+create index if not exists idx_jobs_company_trgm on jobs using gin (company_name gin_trgm_ops);
+create index if not exists idx_jobs_title_trgm on jobs using gin (job_title gin_trgm_ops);
+
 -- Updated_at auto-maintenance
 create or replace function set_updated_at()
 returns trigger as $$
@@ -72,6 +79,22 @@ drop trigger if exists trg_users_updated on users;
 create trigger trg_users_updated before update on users
 for each row execute function set_updated_at();
 
+-- Server-side recency touch so clients don't ship a Python-built
+-- timestamp with every message; callable from PostgREST as an RPC
+create or replace function touch_conversation(conv_id uuid)
+returns void as $$
+  update conversations
+  set last_message_at = now(), updated_at = now()
+  where id = conv_id;
+$$ language sql;
+
+create or replace function touch_conversations(conv_ids uuid[])
+returns void as $$
+  update conversations
+  set last_message_at = now(), updated_at = now()
+  where id = any(conv_ids);
+$$ language sql;
+
 drop trigger if exists trg_conversations_updated on conversations;
 create trigger trg_conversations_updated before update on conversations
 for each row execute function set_updated_at();